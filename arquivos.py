@@ -0,0 +1,21 @@
+""" Utilitários de arquivo compartilhados pelos caches em disco (bandeiras, atlas, índice). """
+import hashlib
+import os
+import tempfile
+
+def gravar_atomico(caminho, conteudo):
+    """ Grava num temporário na mesma pasta e troca com os.replace (nunca deixa arquivo pela metade). """
+    pasta = os.path.dirname(caminho) or '.'
+    fd, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(conteudo)
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def sha256_arquivo(caminho):
+    with open(caminho, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
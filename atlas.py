@@ -0,0 +1,107 @@
+""" Atlas de texturas das bandeiras.
+
+Junta todas as bandeiras, já redimensionadas para o tamanho da carta, numa única imagem
+BGRA sem compressão (assets/cache/bandeiras_atlas.bgra) com um índice JSON de posições.
+Na inicialização o jogo lê só esse arquivo e recorta subsurfaces, em vez de decodificar e
+redimensionar um PNG por carta. BGRA é o formato que convert_alpha produz na maioria das
+telas, então em geral nem a conversão é necessária: os pixels são usados direto do buffer lido.
+
+O índice guarda uma chave calculada a partir do conteúdo do baralho.json e do tamanho/mtime de
+cada PNG de origem; se algo mudar, o atlas é reconstruído.
+
+Uso (passo de build opcional, o jogo também reconstrói sozinho quando precisa):
+    python atlas.py [--baralho baralho.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import pygame
+
+import bandeiras
+import compilador
+from arquivos import gravar_atomico
+
+TAMANHO_BANDEIRA = (240, 140)
+COLUNAS = 8
+PASTA_CACHE = "assets/cache"
+ARQUIVO_ATLAS = os.path.join(PASTA_CACHE, "bandeiras_atlas.bgra")
+ARQUIVO_INDICE = os.path.join(PASTA_CACHE, "bandeiras_atlas.json")
+
+def calcular_chave(arquivo_baralho, nomes):
+    h = hashlib.sha256()
+    with open(arquivo_baralho, 'rb') as f:
+        h.update(f.read())
+    h.update(repr(TAMANHO_BANDEIRA).encode())
+    for nome in nomes:
+        caminho = bandeiras.caminho_bandeira(nome)
+        try:
+            info = os.stat(caminho)
+            h.update(f"{caminho}:{info.st_size}:{info.st_mtime_ns}\n".encode())
+        except OSError:
+            h.update(f"{caminho}:ausente\n".encode())
+    return h.hexdigest()
+
+def construir_atlas(arquivo_baralho, nomes):
+    """ Monta e grava o atlas; retorna (superfície do atlas, posições por nome). """
+    presentes = [nome for nome in nomes if os.path.exists(bandeiras.caminho_bandeira(nome))]
+    largura, altura = TAMANHO_BANDEIRA
+    linhas = max(1, -(-len(presentes) // COLUNAS))
+    atlas = pygame.Surface((largura * COLUNAS, altura * linhas), pygame.SRCALPHA)
+
+    posicoes = {}
+    for i, nome in enumerate(presentes):
+        x, y = (i % COLUNAS) * largura, (i // COLUNAS) * altura
+        imagem = pygame.transform.scale(pygame.image.load(bandeiras.caminho_bandeira(nome)), TAMANHO_BANDEIRA)
+        atlas.blit(imagem, (x, y))
+        posicoes[nome] = [x, y, largura, altura]
+
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    gravar_atomico(ARQUIVO_ATLAS, pygame.image.tobytes(atlas, 'BGRA'))
+    indice = {'chave': calcular_chave(arquivo_baralho, nomes), 'tamanho': atlas.get_size(), 'posicoes': posicoes}
+    gravar_atomico(ARQUIVO_INDICE, json.dumps(indice, ensure_ascii=False).encode('utf-8'))
+    return atlas, posicoes
+
+def _ler_indice():
+    try:
+        with open(ARQUIVO_INDICE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _mascaras_da_tela():
+    return pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+
+def ler_atlas(arquivo_baralho, nomes):
+    """ Retorna (superfície do atlas, posições por nome), do cache ou reconstruindo-o se o
+        baralho ou os PNGs mudaram. Não usa a tela, então pode rodar fora do thread principal. """
+    indice = _ler_indice()
+    if indice and indice.get('chave') == calcular_chave(arquivo_baralho, nomes) and os.path.exists(ARQUIVO_ATLAS):
+        with open(ARQUIVO_ATLAS, 'rb') as f:
+            atlas = pygame.image.frombuffer(bytearray(f.read()), tuple(indice['tamanho']), 'BGRA')
+        return atlas, indice['posicoes']
+    return construir_atlas(arquivo_baralho, nomes)
+
+def recortar(atlas, posicoes):
+    """ {nome: Surface} com as bandeiras do atlas, convertido para o formato da tela se houver
+        uma aberta e ele for diferente (chamar no thread principal). """
+    if pygame.display.get_surface() is not None and atlas.get_masks() != _mascaras_da_tela():
+        atlas = atlas.convert_alpha()
+    return {nome: atlas.subsurface(pygame.Rect(rect)) for nome, rect in posicoes.items()}
+
+def carregar_bandeiras(arquivo_baralho, nomes):
+    """ Retorna {nome: Surface} para as bandeiras disponíveis. """
+    return recortar(*ler_atlas(arquivo_baralho, nomes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o atlas de bandeiras em assets/cache.")
+    parser.add_argument('--baralho', default='baralho.json')
+    args = parser.parse_args()
+
+    nomes = compilador.carregar_dados(args.baralho).nomes
+    _, posicoes = construir_atlas(args.baralho, nomes)
+    print(f"Atlas com {len(posicoes)} bandeiras gravado em {ARQUIVO_ATLAS}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+""" Pré-carregamento concorrente das bandeiras em assets/flags.
+
+Os downloads rodam num pool de threads com uma sessão HTTP compartilhada, antes de as
+cartas serem criadas. Cada arquivo é gravado de forma atômica e registrado num índice
+(ETag + sha256), usado para detectar arquivos corrompidos e revalidar o cache.
+Sem rede, tudo falha rápido e o jogo segue com as imagens provisórias.
+
+Uso avulso (mostra o progresso):
+    python bandeiras.py [--revalidar] [--espelho http://localhost:8000]
+
+A variável de ambiente SUPER_TRUNFO_ESPELHO_BANDEIRAS aponta os downloads para um
+servidor local no lugar de flagcdn.com.
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import compilador
+from arquivos import gravar_atomico, sha256_arquivo
+
+PASTA_BANDEIRAS = "assets/flags"
+ARQUIVO_INDICE = os.path.join(PASTA_BANDEIRAS, "indice.json")
+VARIAVEL_ESPELHO = "SUPER_TRUNFO_ESPELHO_BANDEIRAS"
+
+def caminho_bandeira(nome):
+    return f"{PASTA_BANDEIRAS}/{nome.lower().replace(' ', '_')}.png"
+
+def aplicar_espelho(url, espelho):
+    """ Troca esquema e host da URL pelos do espelho, mantendo o caminho. """
+    if not espelho:
+        return url
+    destino, origem = urlsplit(espelho), urlsplit(url)
+    return urlunsplit((destino.scheme, destino.netloc, destino.path.rstrip('/') + origem.path, origem.query, ''))
+
+def imprimir_progresso(feitas, total):
+    if feitas == total or feitas % max(1, total // 10) == 0:
+        print(f"Bandeiras: {feitas}/{total}", flush=True)
+
+class PrefetchBandeiras:
+    """ Baixa as bandeiras que faltam em paralelo. O nome de cada carta cuja imagem fica
+        pronta é colocado em `prontas` (queue.Queue), para o jogo trocar a imagem provisória. """
+    def __init__(self, cartas, max_workers=8, timeout=5, espelho=None, revalidar=False, ao_progresso=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.espelho = espelho if espelho is not None else os.environ.get(VARIAVEL_ESPELHO)
+        self.revalidar = revalidar
+        self.ao_progresso = ao_progresso
+
+        self.prontas = queue.Queue()
+        self.feitas = 0
+        self._indice_alterado = False
+        self._lock = threading.Lock()
+        self._offline = threading.Event()
+        self._executor = None
+        self._indice = self._ler_indice()
+        # Só entram as bandeiras que faltam (ou todas, ao revalidar), então o progresso é do que há a baixar
+        self.tarefas = [(nome, url) for nome, url in cartas
+                        if url and (revalidar or not self._arquivo_valido(caminho_bandeira(nome)))]
+
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.sessao.mount('https://', adaptador)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.verify = False
+
+    @property
+    def total(self):
+        return len(self.tarefas)
+
+    @property
+    def concluido(self):
+        return self.feitas == self.total
+
+    def _ler_indice(self):
+        try:
+            with open(ARQUIVO_INDICE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_indice(self):
+        with self._lock:
+            conteudo = json.dumps(self._indice, indent=2, sort_keys=True).encode('utf-8')
+        gravar_atomico(ARQUIVO_INDICE, conteudo)
+
+    def _arquivo_valido(self, caminho):
+        """ Arquivos sem entrada no índice (ex.: os que vêm no repositório) são aceitos como estão. """
+        if not os.path.exists(caminho):
+            return False
+        entrada = self._indice.get(os.path.basename(caminho))
+        return entrada is None or entrada.get('sha256') == sha256_arquivo(caminho)
+
+    def iniciar(self):
+        """ Dispara os downloads e retorna imediatamente. """
+        os.makedirs(PASTA_BANDEIRAS, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bandeiras')
+        for nome, url in self.tarefas:
+            self._executor.submit(self._baixar, nome, url)
+        self._executor.shutdown(wait=False)
+        return self
+
+    def esperar(self):
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def _baixar(self, nome, url):
+        caminho = caminho_bandeira(nome)
+        chave = os.path.basename(caminho)
+        baixou = False
+        try:
+            if self._offline.is_set():
+                return
+
+            cabecalhos = {}
+            etag = self._indice.get(chave, {}).get('etag')
+            if etag and self._arquivo_valido(caminho):
+                cabecalhos['If-None-Match'] = etag
+
+            resposta = self.sessao.get(aplicar_espelho(url, self.espelho), headers=cabecalhos, timeout=self.timeout)
+            if resposta.status_code == 200:
+                gravar_atomico(caminho, resposta.content)
+                with self._lock:
+                    self._indice[chave] = {
+                        'url': url,
+                        'etag': resposta.headers.get('ETag'),
+                        'sha256': hashlib.sha256(resposta.content).hexdigest(),
+                    }
+                    self._indice_alterado = True
+                baixou = True
+            elif resposta.status_code != 304:
+                print(f"AVISO: Falha ao baixar a bandeira de {nome} (HTTP {resposta.status_code})")
+        except requests.exceptions.ConnectionError:
+            # Sem rede: as próximas tarefas nem tentam, o jogo segue com as imagens provisórias
+            if not self._offline.is_set():
+                self._offline.set()
+                print("AVISO: Sem conexão, usando imagens provisórias para as bandeiras que faltam")
+        except requests.exceptions.RequestException:
+            print(f"AVISO: Falha ao baixar a bandeira de {nome}")
+        finally:
+            if baixou:
+                self.prontas.put(nome)
+            self._tarefa_concluida()
+
+    def _tarefa_concluida(self):
+        with self._lock:
+            self.feitas += 1
+            feitas = self.feitas
+        if self.ao_progresso:
+            self.ao_progresso(feitas, self.total)
+        if feitas == self.total:
+            if self._indice_alterado:
+                self._gravar_indice()
+            self.sessao.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Baixa as bandeiras do baralho para assets/flags.")
+    parser.add_argument('--baralho', default='baralho.json')
+    parser.add_argument('--espelho', default=None, help=f"Servidor no lugar de flagcdn.com (ou ${VARIAVEL_ESPELHO})")
+    parser.add_argument('--revalidar', action='store_true', help="Revalida arquivos existentes via ETag")
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    dados = compilador.carregar_dados(args.baralho)
+    prefetch = PrefetchBandeiras(zip(dados.nomes, dados.bandeira_urls), max_workers=args.threads,
+                                 espelho=args.espelho, revalidar=args.revalidar, ao_progresso=imprimir_progresso)
+    prefetch.iniciar().esperar()
+    if not prefetch.total:
+        print("Todas as bandeiras já estão em cache.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+""" Benchmarks do Super Trunfo. Rode da raiz do repositório, ex.: python -m benchmarks.bench_rodada """
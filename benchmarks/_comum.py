@@ -0,0 +1,35 @@
+""" Utilitários compartilhados pelos benchmarks. """
+import random
+import time
+
+ATRIBUTOS = ('populacao', 'area', 'pib', 'expectativa_vida', 'idh', 'forca_militar')
+
+def gerar_cartas_data(n, seed=0):
+    """ Gera n cartas no formato do baralho.json, com um super-trunfo e um anti-trunfo. """
+    rng = random.Random(seed)
+    cartas = []
+    for i in range(n):
+        cartas.append({
+            'nome': f"Carta {i}",
+            'bandeira_url': '',
+            'atributos': {
+                'populacao': round(rng.uniform(0.1, 1500), 1),
+                'area': rng.randint(700, 17000000),
+                'pib': round(rng.uniform(0.01, 26), 2),
+                'expectativa_vida': round(rng.uniform(50, 85), 1),
+                'idh': round(rng.uniform(0.3, 0.99), 3),
+                'forca_militar': rng.randint(1, 100),
+            },
+            'super_trunfo': i == 0,
+            'anti_trunfo': i == 1,
+        })
+    return cartas
+
+def cronometrar(funcao, repeticoes=5):
+    """ Melhor tempo (s) entre as repetições. """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
@@ -0,0 +1,32 @@
+""" Tempo de carregamento do baralho: baralho.json (json.load + DadosBaralho) vs baralho binário compilado.
+
+    python -m benchmarks.bench_baralho
+"""
+import json
+import os
+import tempfile
+
+import compilador
+import motor
+from benchmarks._comum import cronometrar, gerar_cartas_data
+
+TAMANHOS = (36, 10000, 100000)
+
+def main():
+    with tempfile.TemporaryDirectory() as pasta:
+        for n in TAMANHOS:
+            arquivo_json = os.path.join(pasta, f"baralho_{n}.json")
+            with open(arquivo_json, 'w', encoding='utf-8') as f:
+                json.dump(gerar_cartas_data(n), f, ensure_ascii=False)
+            arquivo_bin = compilador.caminho_binario(arquivo_json)
+            compilador.compilar(arquivo_json)
+
+            t_json = cronometrar(lambda: motor.DadosBaralho.de_json(arquivo_json))
+            t_bin = cronometrar(lambda: compilador.ler_binario(arquivo_bin))
+            t_cache = cronometrar(lambda: compilador.carregar_dados(arquivo_json)) # Inclui o sha256 do JSON
+            print(f"{n:>7} cartas  JSON {os.path.getsize(arquivo_json) / 1024:8.0f} KiB {t_json * 1000:8.2f} ms   "
+                  f"binário {os.path.getsize(arquivo_bin) / 1024:6.0f} KiB {t_bin * 1000:7.2f} ms ({t_json / t_bin:4.1f}x)   "
+                  f"via cache {t_cache * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
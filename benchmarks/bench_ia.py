@@ -0,0 +1,54 @@
+""" IA difícil (Monte Carlo) contra a IA normal: decisões por segundo e taxa de vitória.
+
+    python -m benchmarks.bench_ia [--partidas 300] [--orcamento-ms 10]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+import ia
+import indice
+import motor
+
+def medir_decisoes(dados, orcamento_ms, n=50):
+    rng = random.Random(0)
+    inicio = time.perf_counter()
+    determinizacoes = 0
+    for _ in range(n):
+        partida = motor.Partida(dados.cartas, rng)
+        _, d = ia.escolher_atributo_dificil(dados, [c.indice for c in partida.mao_ia],
+                                            [c.indice for c in partida.mao_jogador], (), orcamento_ms, rng)
+        determinizacoes += d
+    duracao = time.perf_counter() - inicio
+    return n / duracao, determinizacoes / n
+
+def confronto(dados, partidas, orcamento_ms, max_rodadas, dificil):
+    """ Jogador sempre NORMAL; IA NORMAL ou DIFÍCIL. Conta o vencedor de cada partida. """
+    normal = lambda carta, rng: motor.escolher_atributo(carta, motor.Difficulty.NORMAL, rng)
+    resultado = Counter()
+    for seed in range(partidas):
+        partida = motor.Partida(dados.cartas, random.Random(seed), max_rodadas)
+        escolha_ia = ia.escolha_dificil(partida, orcamento_ms) if dificil else normal
+        resultado[partida.jogar(normal, escolha_ia)] += 1
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--partidas', type=int, default=300)
+    parser.add_argument('--orcamento-ms', type=float, default=10)
+    parser.add_argument('--max-rodadas', type=int, default=300)
+    args = parser.parse_args()
+    dados = indice.carregar_baralho('baralho.json') # O mesmo carregamento (e a mesma IA normal) do jogo
+
+    for orcamento in (1, 10, ia.ORCAMENTO_MS):
+        por_segundo, determinizacoes = medir_decisoes(dados, orcamento, n=max(4, 200 // orcamento))
+        print(f"Orçamento {orcamento:>4} ms: {por_segundo:8.1f} decisões/s, {determinizacoes:7.1f} determinizações/decisão")
+
+    print(f"\n{args.partidas} partidas contra a IA normal (orçamento {args.orcamento_ms} ms, até {args.max_rodadas} rodadas):")
+    for nome, dificil in (('NORMAL', False), ('DIFICIL', True)):
+        r = confronto(dados, args.partidas, args.orcamento_ms, args.max_rodadas, dificil)
+        print(f"  IA {nome:<8} vitórias {r[motor.IA] / args.partidas:6.1%}  derrotas {r[motor.JOGADOR] / args.partidas:6.1%}  inconclusivas {r[None] / args.partidas:6.1%}")
+
+if __name__ == "__main__":
+    main()
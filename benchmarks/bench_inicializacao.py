@@ -0,0 +1,41 @@
+""" Tempo de carregamento das bandeiras na inicialização: um PNG por carta vs atlas.
+
+    python -m benchmarks.bench_inicializacao
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import atlas
+import bandeiras
+import motor
+from benchmarks._comum import cronometrar
+
+ARQUIVO_BARALHO = 'baralho.json'
+
+def carregar_por_carta(nomes):
+    """ Caminho antigo: load + convert_alpha + scale para cada carta. """
+    imagens = {}
+    for nome in nomes:
+        caminho = bandeiras.caminho_bandeira(nome)
+        if os.path.exists(caminho):
+            imagens[nome] = pygame.transform.scale(pygame.image.load(caminho).convert_alpha(), atlas.TAMANHO_BANDEIRA)
+    return imagens
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    nomes = motor.DadosBaralho.de_json(ARQUIVO_BARALHO).nomes
+    atlas.construir_atlas(ARQUIVO_BARALHO, nomes) # Garante o atlas em cache (partida "quente")
+
+    t_por_carta = cronometrar(lambda: carregar_por_carta(nomes))
+    t_atlas = cronometrar(lambda: atlas.carregar_bandeiras(ARQUIVO_BARALHO, nomes))
+    print(f"Bandeiras: {len(nomes)}")
+    print(f"Um PNG por carta: {t_por_carta * 1000:8.2f} ms")
+    print(f"Atlas em cache:   {t_atlas * 1000:8.2f} ms ({t_por_carta / t_atlas:.1f}x mais rápido)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+""" Tempo de quadro por estado nos dois modos de renderização ('completo' vs 'sujo').
+
+Roda o jogo com o driver de vídeo dummy e um relógio simulado (cada quadro avança 1/60 s),
+passando pelo menu parado e por várias rodadas completas.
+
+    python -m benchmarks.bench_render
+"""
+import os
+import time
+from collections import defaultdict
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import jogo
+from relogio import RelogioJogo
+
+QUADROS_MENU = 300
+QUADROS_PARTIDA = 1500
+
+def medir(modo):
+    relogio = [0.0]
+    j = jogo.Jogo(modo_render=modo, seed=0) # Mesma seed: os dois modos renderizam as mesmas partidas
+    j.esperar_carregamento()
+    j.relogio = RelogioJogo(fonte_tempo=lambda: relogio[0])
+    tempos = defaultdict(list)
+
+    def quadro():
+        inicio = time.perf_counter()
+        j.processar_eventos()
+        for _ in j.relogio.passos():
+            j.atualizar_logica()
+        j.renderizar_tela()
+        tempos[j.game_state].append(time.perf_counter() - inicio)
+        relogio[0] += 1 / 60
+
+    for _ in range(QUADROS_MENU):
+        quadro()
+    j.resetar_jogo(jogo.Difficulty.NORMAL)
+    for _ in range(QUADROS_PARTIDA):
+        if j.game_state == jogo.GameState.ESCOLHENDO:
+            j.atributo_escolhido = 'area'
+            j.mudar_estado(jogo.GameState.REVELANDO_CARTA_IA)
+            j.anim_duracao = 1.0
+        quadro()
+        if j.game_state == jogo.GameState.FIM_DE_JOGO:
+            j.resetar_jogo(jogo.Difficulty.NORMAL)
+    return tempos
+
+def main():
+    resultados = {modo: medir(modo) for modo in ('completo', 'sujo')}
+    print(f"{'estado':<22} {'completo (ms)':>14} {'sujo (ms)':>10}")
+    for estado in jogo.GameState:
+        medias = [resultados[modo].get(estado) for modo in ('completo', 'sujo')]
+        if all(medias):
+            completo, sujo = (sum(t) / len(t) * 1000 for t in medias)
+            print(f"{estado.name:<22} {completo:>14.3f} {sujo:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+""" Custo por rodada (resolver + recolher cartas) em função do tamanho do baralho.
+
+Compara as mãos em deque (motor.recolher_cartas) com o antigo list.pop(0) + extend,
+cujo custo cresce com o tamanho da mão.
+
+    python -m benchmarks.bench_rodada
+"""
+import random
+from collections import deque
+
+import motor
+from benchmarks._comum import cronometrar, gerar_cartas_data
+
+RODADAS = 20000
+TAMANHOS = (100, 1000, 10000, 50000)
+
+def _recolher_lista(vencedor, mao_jogador, mao_ia, pilha_empate):
+    """ Versão antiga com listas, mantida só para comparação. """
+    cartas_da_rodada = [mao_jogador.pop(0), mao_ia.pop(0)] + pilha_empate
+    pilha_empate.clear()
+    if vencedor == motor.JOGADOR: mao_jogador.extend(cartas_da_rodada)
+    elif vencedor == motor.IA: mao_ia.extend(cartas_da_rodada)
+    else: pilha_empate.extend(cartas_da_rodada)
+
+def _rodadas(cartas, recolher, tipo_mao):
+    """ Executa RODADAS rodadas, redistribuindo as cartas sempre que uma partida acaba.
+        A primeira distribuição fica fora do tempo medido. """
+    rng = random.Random(0)
+    atributos = cartas[0].dados.nomes_atributos
+    mao_jogador, mao_ia = (tipo_mao(m) for m in motor.distribuir(cartas, rng))
+    pilha_empate = tipo_mao()
+    def executar():
+        nonlocal mao_jogador, mao_ia, pilha_empate
+        for _ in range(RODADAS):
+            if not mao_jogador or not mao_ia:
+                mao_jogador, mao_ia = (tipo_mao(m) for m in motor.distribuir(cartas, rng))
+                pilha_empate = tipo_mao()
+            vencedor = motor.resolver_confronto(mao_jogador[0], mao_ia[0], rng.choice(atributos))
+            recolher(vencedor, mao_jogador, mao_ia, pilha_empate)
+    return executar
+
+def main():
+    print(f"{'cartas':>8} {'deque (µs/rodada)':>18} {'lista (µs/rodada)':>18}")
+    for n in TAMANHOS:
+        cartas = motor.DadosBaralho(gerar_cartas_data(n)).cartas
+        t_deque = cronometrar(_rodadas(cartas, motor.recolher_cartas, deque), repeticoes=1)
+        t_lista = cronometrar(_rodadas(cartas, _recolher_lista, list), repeticoes=1)
+        print(f"{n:>8} {t_deque / RODADAS * 1e6:>18.2f} {t_lista / RODADAS * 1e6:>18.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+""" Teste de carga do servidor de partidas (servidor.py) em localhost.
+
+Abre N sessões ociosas (conectam, recebem o 'bem_vindo' e ficam paradas) e, com elas abertas,
+joga M partidas completas com até C clientes ao mesmo tempo: contra a IA do servidor e, em
+pares, humano x humano. Mede a latência de cada jogada (do 'escolher' até o 'rodada'), partidas
+e rodadas por segundo e, quando o próprio script sobe o servidor (--iniciar, Linux), a memória
+do servidor por sessão ociosa.
+
+    python -m benchmarks.carga_servidor --iniciar --ociosas 5000 --partidas 500 --concorrencia 100
+    python -m benchmarks.carga_servidor --porta 7777    (servidor já rodando)
+"""
+import argparse
+import asyncio
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import protocolo
+from servidor import aumentar_limite_arquivos
+
+def memoria_kb(pid):
+    """ Memória residente do processo (VmRSS), ou None fora do Linux. """
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1])
+    except OSError:
+        return None
+
+def iniciar_servidor(max_rodadas):
+    processo = subprocess.Popen([sys.executable, 'servidor.py', '--host', '127.0.0.1', '--porta', '0', '--max-rodadas', str(max_rodadas)],
+                                stdout=subprocess.PIPE, text=True)
+    linha = processo.stdout.readline()
+    encontrado = re.search(r':(\d+) ', linha)
+    if not encontrado:
+        processo.kill()
+        sys.exit(f"O servidor não subiu: {linha!r}")
+    return processo, int(encontrado.group(1))
+
+async def conectar(host, porta):
+    reader, writer = await asyncio.open_connection(host, porta, limit=protocolo.LIMITE_LINHA)
+    bem_vindo = protocolo.decodificar(await reader.readline())
+    return reader, writer, bem_vindo['atributos']
+
+async def jogar_partida(host, porta, oponente, rng, latencias):
+    """ Joga uma partida escolhendo atributos ao acaso; retorna o número de rodadas. """
+    reader, writer, atributos = await conectar(host, porta)
+    writer.write(protocolo.codificar({'tipo': 'entrar', 'oponente': oponente, 'dificuldade': 'NORMAL'}))
+    rodadas, enviado = 0, None
+    while True:
+        mensagem = protocolo.decodificar(await reader.readline())
+        tipo = mensagem['tipo']
+        if tipo == 'fim':
+            break
+        if tipo == 'erro':
+            raise RuntimeError(mensagem['mensagem'])
+        if tipo == 'rodada':
+            rodadas += 1
+            if enviado is not None:
+                latencias.append(time.perf_counter() - enviado)
+                enviado = None
+        if tipo in ('partida', 'rodada') and mensagem['estado']['sua_vez'] and mensagem['estado']['mao'] and mensagem['estado']['oponente']:
+            writer.write(protocolo.codificar({'tipo': 'escolher', 'atributo': rng.choice(atributos)}))
+            enviado = time.perf_counter()
+    writer.close()
+    await writer.wait_closed()
+    return rodadas
+
+async def executar(args, host, porta, pid):
+    rng = random.Random(args.seed)
+    memoria_inicial = memoria_kb(pid) if pid else None
+
+    inicio = time.perf_counter()
+    ociosas = []
+    for lote in range(0, args.ociosas, 500): # Em lotes, para não estourar o backlog do servidor
+        ociosas.extend(await asyncio.gather(*(conectar(host, porta) for _ in range(min(500, args.ociosas - lote)))))
+    duracao_ociosas = time.perf_counter() - inicio
+    if args.ociosas:
+        print(f"{args.ociosas} sessões ociosas abertas em {duracao_ociosas:.2f}s ({args.ociosas / duracao_ociosas:.0f}/s)")
+    memoria_ociosas = memoria_kb(pid) if pid else None
+    if memoria_inicial and memoria_ociosas and args.ociosas:
+        print(f"Memória do servidor: {memoria_inicial / 1024:.1f} MB -> {memoria_ociosas / 1024:.1f} MB "
+              f"({(memoria_ociosas - memoria_inicial) / args.ociosas:.1f} KB por sessão ociosa)")
+
+    latencias = []
+    limite = asyncio.Semaphore(args.concorrencia)
+    async def contra_ia():
+        async with limite:
+            return [await jogar_partida(host, porta, 'ia', random.Random(rng.getrandbits(32)), latencias)]
+    async def entre_humanos():
+        async with limite:
+            return list(await asyncio.gather(*(jogar_partida(host, porta, 'humano', random.Random(rng.getrandbits(32)), latencias)
+                                               for _ in range(2))))[:1] # As duas pontas contam a mesma partida
+    n_humanos = int(args.partidas * args.humanos)
+    tarefas = [entre_humanos() for _ in range(n_humanos)] + [contra_ia() for _ in range(args.partidas - n_humanos)]
+    rng.shuffle(tarefas)
+
+    inicio = time.perf_counter()
+    rodadas = sum(sum(r) for r in await asyncio.gather(*tarefas))
+    duracao = time.perf_counter() - inicio
+    print(f"{args.partidas} partidas ({n_humanos} entre humanos) em {duracao:.2f}s: "
+          f"{args.partidas / duracao:.0f} partidas/s, {rodadas / duracao:.0f} rodadas/s")
+    if latencias:
+        ms = sorted(t * 1000 for t in latencias)
+        print(f"Latência por jogada ({len(ms)}): p50 {statistics.median(ms):.2f} ms, "
+              f"p99 {ms[min(len(ms) - 1, int(0.99 * len(ms)))]:.2f} ms, máx {ms[-1]:.2f} ms")
+    if pid:
+        print(f"Memória do servidor ao final: {memoria_kb(pid) / 1024:.1f} MB")
+
+    for _, writer, _ in ociosas:
+        writer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de partidas em localhost.")
+    parser.add_argument('--iniciar', action='store_true', help="Sobe o servidor num subprocesso (e mede a memória dele)")
+    parser.add_argument('--porta', type=int, default=protocolo.PORTA_PADRAO)
+    parser.add_argument('--ociosas', type=int, default=2000, help="Sessões abertas sem jogar")
+    parser.add_argument('--partidas', type=int, default=200)
+    parser.add_argument('--concorrencia', type=int, default=50, help="Partidas jogadas ao mesmo tempo")
+    parser.add_argument('--humanos', type=float, default=0.5, help="Fração das partidas entre dois clientes")
+    parser.add_argument('--max-rodadas', type=int, default=1000, help="Limite de rodadas do servidor iniciado com --iniciar")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    aumentar_limite_arquivos()
+    processo, porta = iniciar_servidor(args.max_rodadas) if args.iniciar else (None, args.porta)
+    try:
+        asyncio.run(executar(args, '127.0.0.1', porta, processo.pid if processo else None))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+""" Suíte de benchmarks do jogo, headless (driver de vídeo dummy), com resultados em JSON.
+
+Mede carregamento do baralho, construção das cartas, rodadas (resolver + finalizar), latência
+da IA por dificuldade, custo por quadro de desenhar_carta / animar_virada_carta e o tempo até o
+primeiro quadro com caches frios e quentes. Todas as métricas são tempos: menor é melhor.
+
+    python -m benchmarks.suite --saida atual.json
+    python -m benchmarks.suite --saida novo.json --base atual.json [--limite 0.15]
+    python -m benchmarks.suite --resultado novo.json --base atual.json    (só compara)
+
+Com --base, termina com código 1 se alguma métrica piorar mais que --limite (fração).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import atlas
+import bandeiras
+import compilador
+import indice
+import jogo
+import motor
+from benchmarks import bench_render
+from benchmarks._comum import cronometrar
+
+VERSAO = 1
+ARQUIVO_BARALHO = 'baralho.json'
+GRUPOS = ('baralho', 'rodada', 'ia', 'render', 'inicio')
+
+# --- Baralho e cartas ---
+
+def medir_baralho(metricas):
+    dados = indice.carregar_baralho(ARQUIVO_BARALHO) # Deixa o binário e o índice em cache
+    metricas['baralho_dados_ms'] = cronometrar(lambda: indice.carregar_baralho(ARQUIVO_BARALHO)) * 1000
+
+    baralho = jogo.Baralho(ARQUIVO_BARALHO, dados)
+    baralho.prefetch.esperar()
+    metricas['cartas_construcao_us'] = cronometrar(
+        lambda: [jogo.Carta(dados, i, baralho) for i in range(len(dados))]) / len(dados) * 1e6
+
+    def primeiras_bandeiras():
+        baralho.imagens_atlas, baralho.imagens = None, {}
+        for carta in baralho.cartas:
+            baralho.imagem_bandeira(carta.indice)
+    metricas['bandeiras_primeiro_desenho_ms'] = cronometrar(primeiras_bandeiras) * 1000
+
+# --- Jogo headless ---
+
+def criar_jogo():
+    random.seed(0)
+    j = jogo.Jogo(seed=0)
+    j.esperar_carregamento()
+    j.resetar_jogo(motor.Difficulty.NORMAL)
+    return j
+
+def medir_rodada(metricas, j, rodadas=5000):
+    atributos = j.baralho.dados.nomes_atributos
+    rng = random.Random(0)
+    def jogar():
+        for _ in range(rodadas):
+            if not j.mao_jogador or not j.mao_ia:
+                j.resetar_jogo(motor.Difficulty.NORMAL)
+            j.atributo_escolhido = rng.choice(atributos)
+            j.resolver_rodada()
+            j.finalizar_rodada()
+    metricas['rodada_jogo_us'] = cronometrar(jogar, repeticoes=3) / rodadas * 1e6
+
+    cartas = j.baralho.dados.cartas
+    def partidas_motor():
+        for seed in range(200):
+            motor.Partida(cartas, random.Random(seed), max_rodadas=500).jogar(*[lambda carta, rng: rng.choice(atributos)] * 2)
+    total_rodadas = 0
+    for seed in range(200):
+        partida = motor.Partida(cartas, random.Random(seed), max_rodadas=500)
+        partida.jogar(*[lambda carta, rng: rng.choice(atributos)] * 2)
+        total_rodadas += partida.rodadas
+    metricas['rodada_motor_us'] = cronometrar(partidas_motor, repeticoes=3) / total_rodadas * 1e6
+
+def medir_ia(metricas, j, decisoes=200):
+    for dificuldade in (motor.Difficulty.FACIL, motor.Difficulty.NORMAL):
+        j.dificuldade = dificuldade
+        metricas[f'ia_{dificuldade.name.lower()}_us'] = cronometrar(
+            lambda: [j.ia_escolhe_atributo() for _ in range(decisoes)]) / decisoes * 1e6
+
+    # Difícil: o caminho do jogo, pedido ao processo do PensadorIA e espera do Future
+    pensador = j.obter_pensador_ia()
+    pensador.pedir(j.mao_ia, j.mao_jogador, j.pilha_empate, j.rng).result() # Sobe o processo
+    latencias = []
+    for _ in range(5):
+        inicio = time.perf_counter()
+        pensador.pedir(j.mao_ia, j.mao_jogador, j.pilha_empate, j.rng).result()
+        latencias.append(time.perf_counter() - inicio)
+    metricas['ia_dificil_ms'] = statistics.median(latencias) * 1000
+
+def medir_render(metricas, j, quadros=300):
+    carta = j.mao_jogador[0]
+    def desenhar(limpar_cache):
+        for _ in range(quadros):
+            if limpar_cache:
+                j.cache_faces.descartar()
+            j.desenhar_carta(j.tela, carta, jogo.POS_CARTA_JOGADOR)
+    metricas['desenhar_carta_us'] = cronometrar(lambda: desenhar(False)) / quadros * 1e6
+    metricas['desenhar_carta_sem_cache_us'] = cronometrar(lambda: desenhar(True)) / quadros * 1e6
+
+    carta_ia = j.mao_ia[0]
+    def animar():
+        for i in range(quadros):
+            j.anim_progresso = i / (quadros - 1)
+            j.animar_virada_carta(carta_ia)
+    metricas['animar_virada_carta_us'] = cronometrar(animar) / quadros * 1e6
+
+    for modo in ('completo', 'sujo'):
+        tempos = bench_render.medir(modo)
+        todos = [t for lista in tempos.values() for t in lista]
+        metricas[f'quadro_{modo}_ms'] = sum(todos) / len(todos) * 1000
+
+# --- Início do programa (processo novo) ---
+
+CODIGO_INICIO = '''
+import time
+inicio = time.perf_counter()
+import json, os, sys
+import jogo
+j = jogo.Jogo(arquivo_baralho=sys.argv[1])
+j.renderizar_tela()
+primeiro_quadro = time.perf_counter() - inicio
+while j.game_state == jogo.GameState.CARREGANDO:
+    time.sleep(0.0005)
+    j.aplicar_carregamento()
+j.renderizar_tela()
+print(json.dumps({'primeiro_quadro': primeiro_quadro, 'menu': time.perf_counter() - inicio}), flush=True)
+os._exit(0)
+'''
+
+def _iniciar_processo(pasta):
+    """ Roda o início do jogo com `pasta` como diretório de trabalho: o baralho, o binário, o
+        índice e o atlas (assets/cache) que ele lê e grava são os da pasta, não os do repositório. """
+    saida = subprocess.run([sys.executable, '-c', CODIGO_INICIO, ARQUIVO_BARALHO], capture_output=True, text=True,
+                           check=True, cwd=pasta, env=dict(os.environ, PYTHONPATH=os.getcwd()))
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def _limpar_caches(pasta):
+    caminhos = [compilador.caminho_binario(ARQUIVO_BARALHO), indice.caminho_indice(ARQUIVO_BARALHO),
+                atlas.ARQUIVO_ATLAS, atlas.ARQUIVO_INDICE]
+    for caminho in caminhos:
+        caminho = os.path.join(pasta, caminho)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+def medir_inicio(metricas, repeticoes=3):
+    with tempfile.TemporaryDirectory() as pasta:
+        shutil.copy(ARQUIVO_BARALHO, pasta)
+        if os.path.isdir(bandeiras.PASTA_BANDEIRAS): # O atlas frio é montado a partir das bandeiras baixadas
+            shutil.copytree(bandeiras.PASTA_BANDEIRAS, os.path.join(pasta, bandeiras.PASTA_BANDEIRAS))
+        for tipo in ('frio', 'quente'):
+            amostras = []
+            for _ in range(repeticoes):
+                if tipo == 'frio':
+                    _limpar_caches(pasta)
+                amostras.append(_iniciar_processo(pasta))
+            metricas[f'inicio_{tipo}_primeiro_quadro_ms'] = statistics.median(a['primeiro_quadro'] for a in amostras) * 1000
+            metricas[f'inicio_{tipo}_menu_ms'] = statistics.median(a['menu'] for a in amostras) * 1000
+
+# --- Execução e comparação ---
+
+def executar(grupos):
+    metricas = {}
+    if 'baralho' in grupos:
+        medir_baralho(metricas)
+    if {'rodada', 'ia', 'render'} & set(grupos):
+        j = criar_jogo()
+        if 'render' in grupos:
+            medir_render(metricas, j)
+        if 'ia' in grupos:
+            medir_ia(metricas, j)
+        if 'rodada' in grupos:
+            medir_rodada(metricas, j)
+        if j.pensador_ia is not None:
+            j.pensador_ia.encerrar()
+        j.carregador.encerrar()
+        pygame.quit()
+    if 'inicio' in grupos:
+        medir_inicio(metricas)
+    return {
+        'versao': VERSAO,
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ambiente': {'python': platform.python_version(), 'pygame': pygame.version.ver, 'plataforma': platform.platform()},
+        'metricas': metricas,
+    }
+
+def comparar(base, atual, limite):
+    """ Imprime a comparação e retorna os nomes das métricas que pioraram mais que `limite`. """
+    regressoes = []
+    print(f"{'métrica':<36} {'base':>12} {'atual':>12} {'variação':>9}")
+    for nome, valor in atual['metricas'].items():
+        anterior = base['metricas'].get(nome)
+        if anterior is None:
+            print(f"{nome:<36} {'-':>12} {valor:>12.3f}      nova")
+            continue
+        variacao = valor / anterior - 1 if anterior else 0.0
+        marca = ''
+        if variacao > limite:
+            regressoes.append(nome)
+            marca = '  REGRESSÃO'
+        print(f"{nome:<36} {anterior:>12.3f} {valor:>12.3f} {variacao:>+9.1%}{marca}")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do jogo (headless).")
+    parser.add_argument('--grupos', default=','.join(GRUPOS), help="Grupos a medir, separados por vírgula")
+    parser.add_argument('--saida', help="Grava os resultados neste arquivo JSON")
+    parser.add_argument('--resultado', help="Usa um resultado já gravado em vez de medir")
+    parser.add_argument('--base', help="Resultado de referência para comparar")
+    parser.add_argument('--limite', type=float, default=0.15, help="Piora máxima aceita por métrica (fração, padrão 0.15)")
+    args = parser.parse_args()
+
+    if args.resultado:
+        with open(args.resultado, 'r', encoding='utf-8') as f:
+            resultado = json.load(f)
+    else:
+        resultado = executar(args.grupos.split(','))
+        if args.saida:
+            with open(args.saida, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2)
+
+    if not args.base:
+        for nome, valor in resultado['metricas'].items():
+            print(f"{nome:<36} {valor:>12.3f}")
+        return
+
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    regressoes = comparar(base, resultado, args.limite)
+    if regressoes:
+        print(f"\n{len(regressoes)} métrica(s) pioraram mais de {args.limite:.0%}: {', '.join(regressoes)}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+""" Caches de superfícies já renderizadas, para não redesenhar o mesmo conteúdo a cada quadro. """
+from collections import OrderedDict
+
+class CacheLRU:
+    """ Dicionário limitado: ao passar de `capacidade`, descarta o item usado há mais tempo. """
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave, criar):
+        """ Retorna o item da chave, chamando criar() só quando ele não está no cache. """
+        item = self.itens.get(chave)
+        if item is not None:
+            self.itens.move_to_end(chave)
+            self.acertos += 1
+            return item
+
+        self.faltas += 1
+        item = self.itens[chave] = criar()
+        if len(self.itens) > self.capacidade:
+            self.itens.popitem(last=False)
+        return item
+
+    def descartar(self, filtro=None):
+        """ Remove todos os itens, ou só aqueles cuja chave satisfaz filtro(chave). """
+        if filtro is None:
+            self.itens.clear()
+        else:
+            for chave in [c for c in self.itens if filtro(c)]:
+                del self.itens[chave]
+
+    def __len__(self):
+        return len(self.itens)
+
+class CacheTexto:
+    """ Memoriza superfícies de texto por (fonte, texto, cor, antialias).
+        A fonte entra na chave pelo próprio objeto pygame.font.Font. """
+    def __init__(self, capacidade=512):
+        self.cache = CacheLRU(capacidade)
+
+    def renderizar(self, fonte, texto, cor, antialias=True):
+        return self.cache.obter((fonte, texto, cor, antialias), lambda: fonte.render(texto, antialias, cor))
+
+    @property
+    def acertos(self):
+        return self.cache.acertos
+
+    @property
+    def faltas(self):
+        return self.cache.faltas
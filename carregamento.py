@@ -0,0 +1,60 @@
+""" Carregamento de assets em segundo plano.
+
+O trabalho de disco, rede e decodificação roda em threads. Os resultados voltam ao thread
+principal por uma fila e só são aplicados lá (aplicar_prontos), porque a conversão de
+superfícies para o formato da tela (convert/convert_alpha) precisa acontecer no thread
+principal.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+class CarregadorAssets:
+    """ Fila de tarefas de carregamento. Com um worker (o padrão), as tarefas rodam e chegam ao
+        thread principal na ordem em que foram agendadas, então uma tarefa pode usar o Future de
+        outra agendada antes dela. """
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='carregamento')
+        self._prontos = queue.Queue()
+        self.etapas = []
+        self.concluidas = 0
+
+    def agendar(self, nome, funcao, ao_concluir):
+        """ Roda funcao() numa thread; ao_concluir(resultado) é chamado depois, no thread principal,
+            por aplicar_prontos(). Retorna o Future da tarefa. """
+        self.etapas.append(nome)
+        futuro = self._executor.submit(funcao)
+        futuro.add_done_callback(lambda f: self._prontos.put((f, ao_concluir)))
+        return futuro
+
+    def aplicar_prontos(self):
+        """ Aplica os resultados que já chegaram e retorna quantos foram. Uma exceção da tarefa é
+            relançada aqui, no thread principal. """
+        aplicados = 0
+        while True:
+            try:
+                futuro, ao_concluir = self._prontos.get_nowait()
+            except queue.Empty:
+                return aplicados
+            ao_concluir(futuro.result())
+            self.concluidas += 1
+            aplicados += 1
+
+    @property
+    def total(self):
+        return len(self.etapas)
+
+    @property
+    def concluido(self):
+        return self.concluidas == self.total
+
+    @property
+    def progresso(self):
+        return self.concluidas / self.total if self.etapas else 1.0
+
+    @property
+    def etapa_atual(self):
+        """ Nome da próxima tarefa a ser aplicada (None quando tudo terminou). """
+        return None if self.concluido else self.etapas[self.concluidas]
+
+    def encerrar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
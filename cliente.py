@@ -0,0 +1,83 @@
+""" Conexão do jogo pygame com o servidor de partidas (servidor.py).
+
+O socket é lido numa thread, que põe as mensagens numa fila; o thread principal as consome a
+cada quadro (como o CarregadorAssets), sem nunca bloquear a renderização esperando a rede.
+"""
+import queue
+import socket
+import threading
+
+import protocolo
+
+class ClienteRede:
+    """ ao_receber() é chamado pela thread de leitura a cada mensagem (ex.: para acordar um loop
+        que esteja dormindo em pygame.event.wait). Uma mensagem None na fila indica que a conexão caiu. """
+    def __init__(self, host, porta, ao_receber=None, timeout=5):
+        self._socket = socket.create_connection((host, porta), timeout)
+        self._socket.settimeout(None)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.ao_receber = ao_receber
+        self.mensagens = queue.Queue()
+        threading.Thread(target=self._ler, name='rede', daemon=True).start()
+
+    def _ler(self):
+        try:
+            with self._socket.makefile('rb') as arquivo:
+                for linha in arquivo:
+                    try:
+                        mensagem = protocolo.decodificar(linha)
+                    except ValueError as erro:
+                        mensagem = {'tipo': 'erro', 'mensagem': f"resposta inválida do servidor: {erro}"}
+                    self._entregar(mensagem)
+        except OSError:
+            pass
+        self._entregar(None)
+
+    def _entregar(self, mensagem):
+        self.mensagens.put(mensagem)
+        ao_receber = self.ao_receber
+        if ao_receber is not None:
+            ao_receber()
+
+    def enviar(self, **mensagem):
+        try:
+            self._socket.sendall(protocolo.codificar(mensagem))
+        except OSError:
+            pass # A thread de leitura já avisa que a conexão caiu
+
+    def recebidas(self):
+        """ Mensagens que já chegaram, na ordem. """
+        while True:
+            try:
+                yield self.mensagens.get_nowait()
+            except queue.Empty:
+                return
+
+    def fechar(self):
+        self.ao_receber = None # Quem recebia (ex.: o loop do pygame) pode já estar encerrado
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+class MaoOponente:
+    """ A mão do oponente do lado do cliente: só o tamanho e, depois da escolha, a carta do topo
+        (None até ser revelada). Tem o necessário para o Jogo desenhar (len, [0], iteração). """
+    __slots__ = ('tamanho', 'topo')
+
+    def __init__(self, tamanho, topo=None):
+        self.tamanho = tamanho
+        self.topo = topo
+
+    def __len__(self):
+        return self.tamanho
+
+    def __getitem__(self, posicao):
+        if posicao != 0:
+            raise IndexError("só a carta do topo do oponente é conhecida")
+        return self.topo
+
+    def __iter__(self):
+        if self.topo is not None:
+            yield self.topo
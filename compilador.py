@@ -0,0 +1,252 @@
+""" Compilador de baralhos: valida o baralho.json e gera um baralho binário compacto.
+
+O JSON é a fonte editável; o jogo e o simulador carregam o binário (baralho.bin), que não
+precisa de parsing: um cabeçalho fixo, a matriz cartas x atributos em float64 e as flags de
+super/anti-trunfo são lidos direto para os arrays de motor.DadosBaralho, e os textos vêm de
+uma única tabela UTF-8 separada por '\\0'.
+
+Formato (little-endian):
+    cabeçalho   CABECALHO (assinatura, versão, n_atributos, n_cartas, bytes da tabela de textos,
+                sha256 do JSON de origem)
+    tipos       n_atributos bytes, b'i' ou b'f'
+    (preenchimento até múltiplo de 8, para a matriz poder ser mapeada como float64)
+    matriz      n_cartas * n_atributos float64, linha por carta
+    flags       n_cartas bytes de super-trunfo, depois n_cartas bytes de anti-trunfo
+    textos      atributos, nomes e URLs das bandeiras, separados por '\\0'
+
+O binário guarda o hash do JSON de origem: carregar_dados() só recompila quando o JSON muda.
+
+Uso:
+    python compilador.py [baralho.json] [-o baralho.bin] [--verificar]
+"""
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import motor
+from arquivos import gravar_atomico
+
+ASSINATURA = b'STRB'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sHHII32s')
+EXTENSAO = '.bin'
+MAX_ERROS_EXIBIDOS = 20
+
+class ErroBaralho(ValueError):
+    """ Baralho inválido; `erros` lista todos os problemas encontrados. """
+    def __init__(self, erros):
+        self.erros = erros
+        resumo = '\n  '.join(erros[:MAX_ERROS_EXIBIDOS])
+        if len(erros) > MAX_ERROS_EXIBIDOS:
+            resumo += f"\n  ... e mais {len(erros) - MAX_ERROS_EXIBIDOS}"
+        super().__init__(f"Baralho inválido ({len(erros)} erro(s)):\n  {resumo}")
+
+def caminho_binario(arquivo_json):
+    return os.path.splitext(arquivo_json)[0] + EXTENSAO
+
+# --- Validação ---
+
+def _numero_valido(valor):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        return False
+    # Vira float64 na matriz; um int grande demais nem passa por math.isfinite (OverflowError)
+    return abs(valor) <= sys.float_info.max if isinstance(valor, int) else math.isfinite(valor)
+
+def _texto_valido(valor):
+    return isinstance(valor, str) and '\0' not in valor
+
+def validar(cartas_data):
+    """ Retorna a lista de erros do baralho (vazia se estiver tudo certo). """
+    if not isinstance(cartas_data, list) or len(cartas_data) < 2:
+        return ["o baralho deve ser uma lista com pelo menos 2 cartas"]
+
+    erros = []
+    atributos_esperados = None
+    nomes_vistos = set()
+    super_trunfos = []
+    for i, carta in enumerate(cartas_data):
+        if not isinstance(carta, dict):
+            erros.append(f"carta {i}: deve ser um objeto")
+            continue
+        nome = carta.get('nome')
+        rotulo = f"carta {i} ({nome!r})"
+        if not _texto_valido(nome) or not nome.strip():
+            erros.append(f"{rotulo}: 'nome' ausente ou inválido")
+        elif nome in nomes_vistos:
+            erros.append(f"{rotulo}: nome repetido")
+        else:
+            nomes_vistos.add(nome)
+        if not _texto_valido(carta.get('bandeira_url', '')):
+            erros.append(f"{rotulo}: 'bandeira_url' deve ser texto")
+
+        atributos = carta.get('atributos')
+        if not isinstance(atributos, dict) or not atributos:
+            erros.append(f"{rotulo}: 'atributos' ausente ou vazio")
+        else:
+            if atributos_esperados is None:
+                atributos_esperados = list(atributos)
+            faltando = [a for a in atributos_esperados if a not in atributos]
+            sobrando = [a for a in atributos if a not in atributos_esperados]
+            if faltando:
+                erros.append(f"{rotulo}: atributos faltando: {', '.join(faltando)}")
+            if sobrando:
+                erros.append(f"{rotulo}: atributos desconhecidos: {', '.join(sobrando)}")
+            for nome_attr, valor in atributos.items():
+                if not _texto_valido(nome_attr):
+                    erros.append(f"{rotulo}: nome de atributo inválido {nome_attr!r}")
+                if not _numero_valido(valor):
+                    erros.append(f"{rotulo}: atributo '{nome_attr}' deve ser um número finito (veio {valor!r})")
+
+        for flag in ('super_trunfo', 'anti_trunfo'):
+            if not isinstance(carta.get(flag, False), bool):
+                erros.append(f"{rotulo}: '{flag}' deve ser true ou false")
+        if carta.get('super_trunfo') is True:
+            super_trunfos.append(i)
+            if carta.get('anti_trunfo') is True:
+                erros.append(f"{rotulo}: não pode ser super-trunfo e anti-trunfo ao mesmo tempo")
+
+    if len(super_trunfos) != 1:
+        erros.append(f"o baralho deve ter exatamente um super-trunfo (tem {len(super_trunfos)}: cartas {super_trunfos})")
+    return erros
+
+def normalizar(cartas_data):
+    """ Valida e devolve um DadosBaralho com os atributos na ordem da primeira carta. """
+    erros = validar(cartas_data)
+    if erros:
+        raise ErroBaralho(erros)
+    nomes_atributos = list(cartas_data[0]['atributos'])
+    return motor.DadosBaralho.de_colunas(
+        nomes_atributos,
+        [int if all(isinstance(c['atributos'][nome], int) for c in cartas_data) else float for nome in nomes_atributos],
+        [c['nome'] for c in cartas_data],
+        [c.get('bandeira_url', '') for c in cartas_data],
+        array('d', (c['atributos'][nome] for c in cartas_data for nome in nomes_atributos)),
+        bytearray(c.get('super_trunfo', False) for c in cartas_data),
+        bytearray(c.get('anti_trunfo', False) for c in cartas_data),
+    )
+
+# --- Formato binário ---
+
+def _preenchimento(tamanho):
+    return -tamanho % 8
+
+def serializar(dados, hash_origem):
+    """ Bytes do baralho binário (hash_origem: sha256 do JSON, 32 bytes). """
+    n, k = len(dados), len(dados.nomes_atributos)
+    textos = '\0'.join(dados.nomes_atributos + dados.nomes + dados.bandeira_urls).encode('utf-8')
+    tipos = b''.join(b'i' if tipo is int else b'f' for tipo in dados.tipos_atributo)
+    matriz = array('d', dados.matriz)
+    if sys.byteorder == 'big':
+        matriz.byteswap()
+    return b''.join([
+        CABECALHO.pack(ASSINATURA, VERSAO, k, n, len(textos), hash_origem),
+        tipos, bytes(_preenchimento(CABECALHO.size + k)),
+        matriz.tobytes(),
+        bytes(dados.super_trunfo), bytes(dados.anti_trunfo),
+        textos,
+    ])
+
+def ler_cabecalho(buffer):
+    """ (n_atributos, n_cartas, tamanho dos textos, hash de origem); ErroBaralho se não for um baralho binário. """
+    if len(buffer) < CABECALHO.size:
+        raise ErroBaralho(["arquivo binário truncado"])
+    assinatura, versao, k, n, tamanho_textos, hash_origem = CABECALHO.unpack_from(buffer)
+    if assinatura != ASSINATURA or versao != VERSAO:
+        raise ErroBaralho([f"não é um baralho binário na versão {VERSAO}"])
+    return k, n, tamanho_textos, hash_origem
+
+def desserializar(buffer):
+    """ DadosBaralho a partir dos bytes (ou de um mmap) do baralho binário. """
+    k, n, tamanho_textos, hash_origem = ler_cabecalho(buffer)
+    pos = CABECALHO.size
+    tipos = [int if t == ord('i') else float for t in buffer[pos:pos + k]]
+    pos += k + _preenchimento(pos + k)
+
+    matriz = array('d')
+    matriz.frombytes(buffer[pos:pos + 8 * n * k])
+    if sys.byteorder == 'big':
+        matriz.byteswap()
+    pos += 8 * n * k
+    super_trunfo = bytearray(buffer[pos:pos + n])
+    anti_trunfo = bytearray(buffer[pos + n:pos + 2 * n])
+    pos += 2 * n
+
+    if len(buffer) != pos + tamanho_textos:
+        raise ErroBaralho(["arquivo binário com tamanho inconsistente"])
+    textos = buffer[pos:pos + tamanho_textos].decode('utf-8').split('\0')
+    dados = motor.DadosBaralho.de_colunas(textos[:k], tipos, textos[k:k + n], textos[k + n:], matriz, super_trunfo, anti_trunfo)
+    dados.hash_origem = hash_origem
+    return dados
+
+def ler_binario(arquivo_bin):
+    with open(arquivo_bin, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        return desserializar(mapa)
+
+# --- Compilação com cache ---
+
+def compilar(arquivo_json, arquivo_bin=None):
+    """ Valida o JSON e grava o binário; retorna o DadosBaralho. """
+    with open(arquivo_json, 'rb') as f:
+        conteudo = f.read()
+    return _compilar(conteudo, hashlib.sha256(conteudo).digest(), arquivo_bin or caminho_binario(arquivo_json))
+
+def _compilar(conteudo, hash_origem, arquivo_bin):
+    try:
+        cartas_data = json.loads(conteudo)
+    except ValueError as erro:
+        raise ErroBaralho([f"JSON inválido: {erro}"]) from None
+    dados = normalizar(cartas_data)
+    dados.hash_origem = hash_origem
+    try:
+        gravar_atomico(arquivo_bin, serializar(dados, hash_origem))
+    except OSError:
+        print(f"AVISO: Não foi possível gravar o baralho compilado em {arquivo_bin}")
+    return dados
+
+def carregar_dados(arquivo):
+    """ DadosBaralho de um baralho .json (usando o binário em cache enquanto o hash do JSON não
+        mudar, e recompilando quando muda) ou direto de um baralho .bin. """
+    if arquivo.endswith(EXTENSAO):
+        return ler_binario(arquivo)
+
+    with open(arquivo, 'rb') as f:
+        conteudo = f.read()
+    hash_origem = hashlib.sha256(conteudo).digest()
+    arquivo_bin = caminho_binario(arquivo)
+    try:
+        with open(arquivo_bin, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            if ler_cabecalho(mapa)[3] == hash_origem:
+                return desserializar(mapa)
+    except (OSError, ValueError):
+        pass # Sem cache, cache de outra versão ou corrompido: recompila
+    return _compilar(conteudo, hash_origem, arquivo_bin)
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida o baralho JSON e gera o baralho binário.")
+    parser.add_argument('baralho', nargs='?', default='baralho.json')
+    parser.add_argument('-o', '--saida', help="Arquivo binário de saída (padrão: <baralho>.bin)")
+    parser.add_argument('--verificar', action='store_true', help="Só valida, sem gravar o binário")
+    args = parser.parse_args()
+
+    try:
+        if args.verificar:
+            with open(args.baralho, 'r', encoding='utf-8') as f:
+                dados = normalizar(json.load(f))
+        else:
+            dados = compilar(args.baralho, args.saida)
+    except (ErroBaralho, ValueError) as erro:
+        sys.exit(f"{args.baralho}: {erro}")
+    except OSError as erro:
+        sys.exit(f"{erro.filename or args.baralho}: {erro.strerror or erro}")
+
+    destino = "válido" if args.verificar else f"compilado em {args.saida or caminho_binario(args.baralho)}"
+    print(f"{args.baralho}: {len(dados)} cartas, atributos {', '.join(dados.nomes_atributos)} - {destino}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+""" Hit-testing das regiões clicáveis da tela. """
+from collections import defaultdict
+
+class MapaCliques:
+    """ Índice espacial (grade uniforme) de regiões clicáveis. Montado uma vez por mudança de
+        layout; cada consulta só testa as regiões da célula onde está o ponto. """
+    def __init__(self, tamanho_celula=64):
+        self.tamanho_celula = tamanho_celula
+        self.celulas = defaultdict(list)
+
+    def limpar(self):
+        self.celulas.clear()
+
+    def adicionar(self, rect, alvo):
+        t = self.tamanho_celula
+        for cx in range(rect.left // t, (rect.right - 1) // t + 1):
+            for cy in range(rect.top // t, (rect.bottom - 1) // t + 1):
+                self.celulas[(cx, cy)].append((rect, alvo))
+
+    def alvo_em(self, pos):
+        """ Retorna o alvo da primeira região (na ordem em que foram adicionadas) que contém pos. """
+        x, y = pos
+        for rect, alvo in self.celulas.get((x // self.tamanho_celula, y // self.tamanho_celula), ()):
+            if rect.collidepoint(pos):
+                return alvo
+        return None
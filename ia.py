@@ -0,0 +1,227 @@
+""" IA "Difícil": Monte Carlo por conjunto de informação, com orçamento de tempo por jogada.
+
+A IA conhece a própria mão e a pilha de empate e lembra de todas as cartas já mostradas na mesa.
+Como quem vence a rodada põe as cartas no fundo da mão numa ordem que todos viram, a mão do
+oponente é sempre um topo de cartas da distribuição inicial, nunca mostradas e de ordem
+desconhecida (cartas_ocultas), seguido de cartas de ordem conhecida. Depois que as cartas
+iniciais dele passam pela mesa, a IA sabe exatamente qual carta ele tem em cada posição.
+
+A rodada atual é calculada exatamente (rodada_imediata: a chance de vencer cada carta que o
+oponente pode ter no topo) e entra como prior na média de cada atributo. Com o tempo que
+sobra, cada simulação sorteia uma ordem possível para as cartas ocultas (uma determinização,
+com elas passando pelo topo em rodízio), joga cada atributo a partir desse mesmo cenário e
+segue a partida por algumas rodadas com a IA normal dos dois lados. O prazo é conferido a cada
+simulação; o atributo com a melhor média vence. Sem cartas ocultas o cenário é o real e uma
+determinização basta.
+
+A decisão roda num processo separado (PensadorIA), então o loop de renderização não trava.
+"""
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import motor
+
+ORCAMENTO_MS = 250 # Tempo de "pensar" por jogada no jogo (a animação da IA dura 1 s)
+PROFUNDIDADE_ROLLOUT = 30
+PESO_IMEDIATA = 16 # Quantas simulações a rodada imediata (exata) vale na média de cada atributo
+
+def cartas_ocultas(iniciais, rodadas):
+    """ Quantas cartas do topo de uma mão ainda são da distribuição inicial (`iniciais` cartas),
+        que os outros jogadores nunca viram: cada rodada tira uma carta do topo de cada mão ativa. """
+    return max(0, iniciais - rodadas)
+
+def _melhor_indice(carta, rng):
+    return motor.escolher_atributo(carta, motor.Difficulty.NORMAL, rng)
+
+def _simular(mao_ia, mao_oponente, pilha_empate, atributo, rng):
+    """ Joga `atributo` na rodada atual e segue até PROFUNDIDADE_ROLLOUT rodadas.
+        Retorna 1 se a IA vence, 0 se perde, ou a fração das cartas com a IA. """
+    partida = motor.Partida.de_maos(mao_oponente, mao_ia, pilha_empate, turno_do_jogador=False,
+                                    rng=rng, max_rodadas=PROFUNDIDADE_ROLLOUT)
+    partida.jogar_rodada(atributo)
+    partida.jogar(_melhor_indice, _melhor_indice)
+
+    if partida.vencedor == motor.IA: return 1.0
+    if partida.vencedor == motor.JOGADOR: return 0.0
+    return len(partida.mao_ia) / (len(partida.mao_ia) + len(partida.mao_jogador) + len(partida.pilha_empate))
+
+def rodada_imediata(carta, oponente, atributos):
+    """ Valor esperado da rodada atual para cada atributo, calculado exatamente: a carta da vez do
+        oponente é qualquer uma de `oponente` com a mesma chance (vitória 1, empate 0.5, derrota 0). """
+    valores = []
+    for atributo in atributos:
+        resultados = [motor.resolver_confronto(carta, outra, atributo) for outra in oponente]
+        valores.append((resultados.count(motor.JOGADOR) + resultados.count(motor.EMPATE) / 2) / max(1, len(oponente)))
+    return valores
+
+def _melhor(atributos, prior, soma, visitas):
+    """ Atributo com a maior média das simulações, partindo da rodada imediata como prior. """
+    medias = [(PESO_IMEDIATA * p + s) / (PESO_IMEDIATA + v) for p, s, v in zip(prior, soma, visitas)]
+    return atributos[max(range(len(atributos)), key=medias.__getitem__)]
+
+def escolher_atributo_dificil(dados, mao_ia, mao_oponente, pilha_empate=(), orcamento_ms=ORCAMENTO_MS, rng=None, desconhecidas=None):
+    """ mao_ia, mao_oponente e pilha_empate são índices de cartas em `dados`; mao_ia[0] é a carta
+        da vez. Só a ordem das `desconhecidas` primeiras cartas do oponente é sorteada (None: todas,
+        ver cartas_ocultas). Retorna (atributo, número de determinizações simuladas). O prazo é
+        conferido a cada simulação, mas pelo menos uma determinização é completada, mesmo com
+        orçamento zero. """
+    rng = rng or random.Random()
+    cartas = dados.cartas
+    atributos = dados.nomes_atributos
+    prazo = time.perf_counter() + orcamento_ms / 1000
+
+    minha = [cartas[i] for i in mao_ia]
+    pilha = [cartas[i] for i in pilha_empate]
+    oponente = [cartas[i] for i in mao_oponente]
+    if desconhecidas is None:
+        desconhecidas = len(oponente)
+    ocultas, conhecidas = oponente[:desconhecidas], oponente[desconhecidas:]
+    prior = rodada_imediata(minha[0], ocultas or oponente[:1], atributos)
+    topos = ocultas[:] # Cada carta oculta vai para o topo em rodízio: a rodada atual fica estratificada
+    rng.shuffle(topos)
+    soma = [0.0] * len(atributos)
+    visitas = [0] * len(atributos)
+    determinizacoes = 0
+
+    while True:
+        rng.shuffle(ocultas)
+        if ocultas:
+            topo = topos[determinizacoes % len(topos)]
+            posicao = ocultas.index(topo)
+            ocultas[0], ocultas[posicao] = topo, ocultas[0]
+        for j, atributo in enumerate(atributos):
+            soma[j] += _simular(minha, ocultas + conhecidas, pilha, atributo, rng)
+            visitas[j] += 1
+            if determinizacoes and time.perf_counter() >= prazo:
+                return _melhor(atributos, prior, soma, visitas), determinizacoes
+        determinizacoes += 1
+        if not ocultas or time.perf_counter() >= prazo:
+            return _melhor(atributos, prior, soma, visitas), determinizacoes
+
+def _simular_n(maos, pilha_empate, vez, atributo, rng):
+    """ Como _simular, numa motor.PartidaN em que a IA é o assento `vez`. """
+    partida = motor.PartidaN.de_maos(maos, pilha_empate, vez, rng, PROFUNDIDADE_ROLLOUT)
+    partida.jogar_rodada(atributo)
+    partida.jogar([_melhor_indice] * len(maos))
+
+    if partida.vencedor is not None:
+        return 1.0 if partida.vencedor == vez else 0.0
+    return len(partida.maos[vez]) / (sum(map(len, partida.maos)) + len(partida.pilha_empate))
+
+def escolher_atributo_dificil_n(dados, maos, vez, pilha_empate=(), orcamento_ms=ORCAMENTO_MS, rng=None, desconhecidas=None):
+    """ Versão para N jogadores: `maos` tem os índices das cartas de cada assento e a IA é o
+        assento `vez`. `desconhecidas[j]` é quantas cartas do topo da mão j a IA nunca viu (None:
+        todas, ver cartas_ocultas). Ela não sabe quem tem quais dessas cartas: cada determinização
+        as redistribui ao acaso entre os topos dos oponentes, mantendo os tamanhos, e o resto de
+        cada mão fica como está. O prior é o produto das chances de a carta da vez vencer o topo de
+        cada oponente ativo (aproximação: como se fossem independentes).
+        Retorna (atributo, número de determinizações simuladas). """
+    rng = rng or random.Random()
+    cartas = dados.cartas
+    atributos = dados.nomes_atributos
+    prazo = time.perf_counter() + orcamento_ms / 1000
+
+    cenario = [[cartas[i] for i in mao] for mao in maos]
+    pilha = [cartas[i] for i in pilha_empate]
+    oponentes = [j for j in range(len(maos)) if j != vez]
+    desconhecidas = [len(mao) if d is None else min(d, len(mao)) for mao, d in zip(maos, desconhecidas or [None] * len(maos))]
+    ocultas = [carta for j in oponentes for carta in cenario[j][:desconhecidas[j]]]
+    conhecidas = {j: cenario[j][desconhecidas[j]:] for j in oponentes}
+    chance_oculta = rodada_imediata(cenario[vez][0], ocultas, atributos)
+    prior = [1.0] * len(atributos)
+    for j in oponentes:
+        if maos[j]:
+            chance = chance_oculta if desconhecidas[j] else rodada_imediata(cenario[vez][0], cenario[j][:1], atributos)
+            prior = [p * c for p, c in zip(prior, chance)]
+    soma = [0.0] * len(atributos)
+    visitas = [0] * len(atributos)
+    determinizacoes = 0
+
+    while True:
+        rng.shuffle(ocultas)
+        inicio = 0
+        for j in oponentes:
+            cenario[j] = ocultas[inicio:inicio + desconhecidas[j]] + conhecidas[j]
+            inicio += desconhecidas[j]
+        for k, atributo in enumerate(atributos):
+            soma[k] += _simular_n(cenario, pilha, vez, atributo, rng)
+            visitas[k] += 1
+            if determinizacoes and time.perf_counter() >= prazo:
+                return _melhor(atributos, prior, soma, visitas), determinizacoes
+        determinizacoes += 1
+        if not ocultas or time.perf_counter() >= prazo:
+            return _melhor(atributos, prior, soma, visitas), determinizacoes
+
+def escolha_dificil(partida, orcamento_ms=ORCAMENTO_MS):
+    """ Adapta a IA difícil ao formato (carta, rng) -> atributo usado por motor.Partida.jogar,
+        para o assento da IA na `partida` (criada antes da primeira rodada). """
+    iniciais = len(partida.mao_jogador)
+    def escolher(carta, rng):
+        atributo, _ = escolher_atributo_dificil(
+            carta.dados,
+            [c.indice for c in partida.mao_ia],
+            [c.indice for c in partida.mao_jogador],
+            [c.indice for c in partida.pilha_empate],
+            orcamento_ms, rng, cartas_ocultas(iniciais, partida.rodadas),
+        )
+        return atributo
+    return escolher
+
+def escolha_dificil_n(partida, orcamento_ms=ORCAMENTO_MS):
+    """ Como escolha_dificil, para motor.PartidaN.jogar: decide pelo assento da vez. """
+    iniciais = [len(mao) for mao in partida.maos]
+    def escolher(carta, rng):
+        atributo, _ = escolher_atributo_dificil_n(
+            carta.dados,
+            [[c.indice for c in mao] for mao in partida.maos],
+            partida.vez,
+            [c.indice for c in partida.pilha_empate],
+            orcamento_ms, rng,
+            [cartas_ocultas(n, partida.rodadas) for n in iniciais],
+        )
+        return atributo
+    return escolher
+
+# --- Processo de decisão ---
+
+_dados = None # DadosBaralho do processo de decisão (ver _iniciar_processo)
+
+def _iniciar_processo(dados):
+    global _dados
+    _dados = dados
+
+def _decidir(mao_ia, mao_oponente, pilha_empate, orcamento_ms, seed, desconhecidas):
+    return escolher_atributo_dificil(_dados, mao_ia, mao_oponente, pilha_empate, orcamento_ms, random.Random(seed), desconhecidas)[0]
+
+def _decidir_n(maos, vez, pilha_empate, orcamento_ms, seed, desconhecidas):
+    return escolher_atributo_dificil_n(_dados, maos, vez, pilha_empate, orcamento_ms, random.Random(seed), desconhecidas)[0]
+
+class PensadorIA:
+    """ Calcula as jogadas da IA difícil num processo à parte e entrega o resultado como Future. """
+    def __init__(self, dados, orcamento_ms=ORCAMENTO_MS, processos=1):
+        self.orcamento_ms = orcamento_ms
+        # 'spawn': um fork copiaria o estado do processo pai (pygame, threads do cliente de rede, o loop asyncio do servidor)
+        self.executor = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_iniciar_processo, initargs=(dados,))
+
+    def pedir(self, mao_ia, mao_oponente, pilha_empate, rng=random, desconhecidas=None):
+        """ Recebe as mãos como sequências de cartas (usa só os índices). `desconhecidas`: ver
+            escolher_atributo_dificil. """
+        return self.executor.submit(
+            _decidir,
+            [c.indice for c in mao_ia], [c.indice for c in mao_oponente], [c.indice for c in pilha_empate],
+            self.orcamento_ms, rng.getrandbits(32), desconhecidas,
+        )
+
+    def pedir_n(self, maos, vez, pilha_empate, rng=random, desconhecidas=None):
+        """ Para N jogadores: as mãos de todos os assentos e o assento da IA que decide. """
+        return self.executor.submit(
+            _decidir_n,
+            [[c.indice for c in mao] for mao in maos], vez, [c.indice for c in pilha_empate],
+            self.orcamento_ms, rng.getrandbits(32), desconhecidas,
+        )
+
+    def encerrar(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,91 @@
+""" Índice de rankings por atributo, para decisões de IA em O(1).
+
+Para cada carta e atributo, o número de outras cartas que ela vence é fixo assim que o baralho
+é carregado. O índice guarda:
+  - ordens[j]: índices das cartas ordenados pelo valor do atributo j (crescente);
+  - vitorias[c * n_atributos + j]: quantas cartas do baralho a carta c vence escolhendo j,
+    já considerando super-trunfo e anti-trunfo (empates não contam);
+  - melhor[c]: o atributo (índice) com mais vitórias para a carta c.
+
+Ele é gravado ao lado do baralho (baralho.json -> baralho.indice.json) e reaproveitado enquanto
+o hash do arquivo não mudar.
+"""
+import json
+import os
+from array import array
+from bisect import bisect_left
+
+import compilador
+from arquivos import gravar_atomico, sha256_arquivo
+
+def caminho_indice(arquivo_json):
+    return os.path.splitext(arquivo_json)[0] + '.indice.json'
+
+class IndiceBaralho:
+    def __init__(self, dados, ordens, vitorias, melhor):
+        self.dados = dados
+        self.ordens = ordens
+        self.vitorias = vitorias
+        self.melhor = melhor
+
+    @classmethod
+    def construir(cls, dados):
+        n, k = len(dados), len(dados.nomes_atributos)
+        super_trunfos = [c for c in range(n) if dados.super_trunfo[c]]
+        comuns = [c for c in range(n) if not dados.super_trunfo[c]]
+        anti_trunfos_count = sum(dados.anti_trunfo)
+
+        ordens = []
+        vitorias = array('i', bytes(4 * n * k))
+        for j in range(k):
+            valores = [dados.matriz[c * k + j] for c in range(n)]
+            ordens.append(array('i', sorted(range(n), key=valores.__getitem__)))
+            valores_comuns = sorted(valores[c] for c in comuns)
+            for c in range(n):
+                if dados.super_trunfo[c]:
+                    # Super-trunfo vence todas, menos os anti-trunfos (e ele mesmo não conta)
+                    vitorias[c * k + j] = n - 1 - anti_trunfos_count
+                else:
+                    # Vence as comuns com valor menor; o anti-trunfo ainda vence os super-trunfos
+                    vitorias[c * k + j] = bisect_left(valores_comuns, valores[c]) + (len(super_trunfos) if dados.anti_trunfo[c] else 0)
+
+        melhor = array('H', (max(range(k), key=lambda j: vitorias[c * k + j]) for c in range(n)))
+        return cls(dados, ordens, vitorias, melhor)
+
+    @classmethod
+    def carregar_ou_construir(cls, dados, arquivo_json):
+        """ Usa o índice gravado ao lado do baralho se o hash bater; senão constrói e grava.
+            O hash é o do JSON que o compilador já calculou (dados.hash_origem), quando houver. """
+        hash_baralho = dados.hash_origem.hex() if dados.hash_origem else sha256_arquivo(arquivo_json)
+        caminho = caminho_indice(arquivo_json)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                salvo = json.load(f)
+            if salvo['hash'] == hash_baralho and salvo['atributos'] == dados.nomes_atributos:
+                return cls(dados, [array('i', o) for o in salvo['ordens']], array('i', salvo['vitorias']), array('H', salvo['melhor']))
+        except (OSError, ValueError, KeyError):
+            pass
+
+        indice = cls.construir(dados)
+        conteudo = {
+            'hash': hash_baralho,
+            'atributos': dados.nomes_atributos,
+            'ordens': [o.tolist() for o in indice.ordens],
+            'vitorias': indice.vitorias.tolist(),
+            'melhor': indice.melhor.tolist(),
+        }
+        try:
+            gravar_atomico(caminho, json.dumps(conteudo, separators=(',', ':')).encode('utf-8'))
+        except OSError:
+            print(f"AVISO: Não foi possível gravar o índice do baralho em {caminho}")
+        return indice
+
+    def melhor_atributo(self, carta):
+        return self.dados.nomes_atributos[self.melhor[carta]]
+
+def carregar_baralho(arquivo_json):
+    """ DadosBaralho do arquivo (validado e compilado, ver compilador.py) com o índice de
+        rankings já anexado (dados.indice). """
+    dados = compilador.carregar_dados(arquivo_json)
+    dados.indice = IndiceBaralho.carregar_ou_construir(dados, arquivo_json)
+    return dados
@@ -1,12 +1,28 @@
-import json
+import argparse
+import cProfile
 import random
 import pygame
-import requests
 import os
 import ssl
 import time
+from collections import defaultdict, deque
 from enum import Enum
 
+import atlas
+import bandeiras
+import cliente
+import ia
+import indice
+import motor
+import protocolo
+import replay
+from cache_render import CacheLRU, CacheTexto
+from carregamento import CarregadorAssets
+from entrada import MapaCliques
+from perfil import Perfilador
+from relogio import INSTANTANEO, RelogioJogo
+from motor import Difficulty
+
 # --- Bloco de correção SSL (mantido do original) ---
 try:
     _create_unverified_https_context = ssl._create_unverified_context
@@ -22,77 +38,110 @@ LARGURA_TELA, ALTURA_TELA = 1000, 700
 LARGURA_CARTA, ALTURA_CARTA = 280, 450
 POS_CARTA_JOGADOR = (100, 150)
 POS_CARTA_IA = (LARGURA_TELA - LARGURA_CARTA - 100, 150)
+AREA_OPONENTES = pygame.Rect(420, 100, 560, 570) # Com mais de 2 jogadores, as cartas dos oponentes ficam numa grade aqui
+MAX_JOGADORES = 13 # A grade comporta até 12 oponentes (4 colunas x 3 linhas) com as cartas ainda legíveis
+FASES_PERFIL = ['processar_eventos', 'aplicar_carregamento', 'processar_rede', 'atualizar_logica', 'face_carta']
+EVENTO_REDE = pygame.USEREVENT + 1 # Postado pela thread de rede para acordar o loop no modo 'sujo'
+VENCEDORES_REMOTOS = {protocolo.VOCE: motor.JOGADOR, protocolo.OPONENTE: motor.IA, protocolo.EMPATE: motor.EMPATE}
 
 # --- ENUMS PARA ESTADOS (Melhoria) ---
 class GameState(Enum):
+    CARREGANDO = 0
     TELA_INICIAL = 1
     ESCOLHENDO = 2
     REVELANDO_CARTA_IA = 3
     RESULTADO = 4
     ANIMANDO_FIM_RODADA = 5
     FIM_DE_JOGO = 6
-
-class Difficulty(Enum):
-    FACIL = 1
-    NORMAL = 2
-    DIFICIL = 3
+    AGUARDANDO = 7 # Esperando o servidor (oponente humano ou início da partida)
 
 # --- CLASSES DO JOGO ---
 
-class Carta:
-    """ Mantida similar à original, mas agora carrega a imagem do verso. """
-    def __init__(self, data):
-        self.nome = data['nome']
-        self.bandeira_url = data['bandeira_url']
-        self.atributos = data['atributos']
-        self.super_trunfo = data.get('super_trunfo', False)
-        self.anti_trunfo = data.get('anti_trunfo', False)
-        self.caminho_imagem = f"assets/flags/{self.nome.lower().replace(' ', '_')}.png"
-        
-        self._baixar_imagem()
+class Carta(motor.Carta):
+    """ Visão sobre DadosBaralho; a imagem da bandeira é do Baralho, carregada só quando desenhada. """
+    __slots__ = ('baralho',)
 
-        if os.path.exists(self.caminho_imagem):
-            self.imagem_bandeira = pygame.image.load(self.caminho_imagem).convert_alpha()
-            self.imagem_bandeira = pygame.transform.scale(self.imagem_bandeira, (240, 140))
-        else:
-            self.imagem_bandeira = pygame.Surface((240, 140))
-            self.imagem_bandeira.fill(CINZA_CLARO)
-
-    def _baixar_imagem(self):
-        if not os.path.exists(self.caminho_imagem):
-            try:
-                resposta = requests.get(self.bandeira_url, stream=True, verify=False, timeout=5)
-                if resposta.status_code == 200:
-                    with open(self.caminho_imagem, 'wb') as f:
-                        f.write(resposta.content)
-            except requests.exceptions.RequestException:
-                print(f"AVISO: Falha ao baixar a bandeira de {self.nome}")
-
-    def obter_valor_atributo(self, nome_attr):
-        return self.atributos.get(nome_attr, 0)
+    def __init__(self, dados, indice, baralho):
+        super().__init__(dados, indice)
+        self.baralho = baralho
+
+    @property
+    def bandeira_url(self):
+        return self.dados.bandeira_urls[self.indice]
+
+    @property
+    def caminho_imagem(self):
+        return bandeiras.caminho_bandeira(self.nome)
+
+    @property
+    def imagem_bandeira(self):
+        return self.baralho.imagem_bandeira(self.indice)
 
 class Baralho:
-    """ Mantida similar à original. """
-    def __init__(self, arquivo_json):
-        self.todas_as_cartas_data = []
-        os.makedirs("assets/flags", exist_ok=True)
-        with open(arquivo_json, 'r', encoding='utf-8') as f:
-            self.todas_as_cartas_data = json.load(f)
-        self.cartas = self._criar_cartas()
-    
-    def _criar_cartas(self):
-        return [Carta(dados) for dados in self.todas_as_cartas_data]
+    """ Os dados das cartas ficam numa matriz compacta (motor.DadosBaralho); cada Carta é só uma visão.
+        As regras ficam prontas na hora; as bandeiras vêm recortadas de um único atlas, instalado pelo
+        carregamento em segundo plano (ou lido na primeira bandeira pedida, sem ele).
+        As que faltam são baixadas em segundo plano (bandeiras.PrefetchBandeiras).
+        Funciona sem janela aberta: a conversão para o formato da tela só acontece se houver uma. """
+    def __init__(self, arquivo_json, dados=None):
+        self.arquivo_json = arquivo_json
+        self.dados = dados if dados is not None else indice.carregar_baralho(arquivo_json)
+        self.imagens_atlas = None # Carregado na primeira bandeira pedida
+        self.imagens = {} # indice da carta -> Surface
+        self.prefetch = bandeiras.PrefetchBandeiras(zip(self.dados.nomes, self.dados.bandeira_urls),
+                                                   ao_progresso=bandeiras.imprimir_progresso).iniciar()
+        self.cartas = [Carta(self.dados, i, self) for i in range(len(self.dados))]
+        self._cartas_por_nome = {carta.nome: carta for carta in self.cartas}
 
-    def embaralhar_e_distribuir(self):
-        cartas_embaralhadas = self.cartas[:]
-        random.shuffle(cartas_embaralhadas)
-        metade = len(cartas_embaralhadas) // 2
-        return cartas_embaralhadas[:metade], cartas_embaralhadas[metade:]
+    def imagem_bandeira(self, indice):
+        imagem = self.imagens.get(indice)
+        if imagem is None:
+            imagem = self.imagens[indice] = self._carregar_imagem(indice)
+        return imagem
+
+    def instalar_atlas(self, imagens_atlas):
+        """ Recebe as bandeiras já recortadas do atlas (ver Jogo.iniciar_carregamento). """
+        if self.imagens_atlas is None:
+            self.imagens_atlas = imagens_atlas
+
+    def _carregar_imagem(self, indice):
+        """ Bandeira do atlas, do PNG (se chegou depois do atlas) ou uma imagem provisória. """
+        if self.imagens_atlas is None:
+            self.imagens_atlas = atlas.carregar_bandeiras(self.arquivo_json, self.dados.nomes)
+        nome = self.dados.nomes[indice]
+        if nome in self.imagens_atlas:
+            return self.imagens_atlas[nome]
+
+        caminho = bandeiras.caminho_bandeira(nome)
+        if os.path.exists(caminho):
+            imagem = pygame.image.load(caminho)
+            if pygame.display.get_surface() is not None:
+                imagem = imagem.convert_alpha()
+            return pygame.transform.scale(imagem, atlas.TAMANHO_BANDEIRA)
+        imagem = pygame.Surface(atlas.TAMANHO_BANDEIRA)
+        imagem.fill(CINZA_CLARO)
+        return imagem
+
+    def atualizar_bandeiras(self):
+        """ Descarta as imagens provisórias das bandeiras que terminaram de baixar (são recarregadas
+            quando desenhadas); retorna as cartas atualizadas. """
+        atualizadas = []
+        while not self.prefetch.prontas.empty():
+            carta = self._cartas_por_nome[self.prefetch.prontas.get_nowait()]
+            self.imagens.pop(carta.indice, None)
+            if self.imagens_atlas is not None:
+                self.imagens_atlas.pop(carta.nome, None)
+            atualizadas.append(carta)
+        return atualizadas
+
+    def embaralhar_e_distribuir(self, rng=random):
+        return motor.distribuir(self.cartas, rng)
 
 class Botao:
     """ (Nova Funcionalidade) Classe para criar botões interativos. """
-    def __init__(self, x, y, largura, altura, texto, cor_fundo, cor_hover, fonte, cor_texto=BRANCO):
+    def __init__(self, x, y, largura, altura, texto, cor_fundo, cor_hover, fonte, cor_texto=BRANCO, cache_texto=None):
         self.rect = pygame.Rect(x, y, largura, altura)
+        self.cache_texto = cache_texto
         self.texto = texto
         self.cor_fundo = cor_fundo
         self.cor_hover = cor_hover
@@ -104,7 +153,10 @@ class Botao:
         cor_atual = self.cor_hover if self.is_hovering else self.cor_fundo
         pygame.draw.rect(surface, cor_atual, self.rect, border_radius=10)
         
-        texto_surf = self.fonte.render(self.texto, True, self.cor_texto)
+        if self.cache_texto:
+            texto_surf = self.cache_texto.renderizar(self.fonte, self.texto, self.cor_texto)
+        else:
+            texto_surf = self.fonte.render(self.texto, True, self.cor_texto)
         texto_rect = texto_surf.get_rect(center=self.rect.center)
         surface.blit(texto_surf, texto_rect)
 
@@ -112,45 +164,111 @@ class Botao:
         self.is_hovering = self.rect.collidepoint(pos_mouse)
 
     def foi_clicado(self, event):
-        return event.type == pygame.MOUSEBUTTONDOWN and self.is_hovering
+        return event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos)
 
 class Jogo:
     """ (Refatoração) Classe principal que encapsula toda a lógica e estado do jogo. """
-    def __init__(self):
+    def __init__(self, mostrar_tempos_quadro=False, modo_render='completo', velocidade=1.0, espectador=False,
+                 seed=None, pasta_replays=None, perfil=False, arquivo_baralho='baralho.json', servidor=None, jogadores=2):
+        if not 2 <= jogadores <= MAX_JOGADORES:
+            raise ValueError(f"jogadores precisa estar entre 2 e {MAX_JOGADORES}, recebido {jogadores}")
+        self.inicio_execucao = time.perf_counter()
+        self.marcos_inicializacao = {}
         pygame.init()
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512) # Prepara o mixer
         self.tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
         pygame.display.set_caption("Super Trunfo - Países (Versão Melhorada)")
         self.clock = pygame.time.Clock()
+        self.relogio = RelogioJogo(escala=velocidade) # Tempo da lógica, separado do clock de renderização
+        self.espectador = espectador # IA joga também no lugar do jogador
         self.rodando = True
+
+        # Com servidor, as partidas acontecem nele e o Jogo só desenha o que chega (ver processar_rede)
+        self.remoto = None
+        if servidor is not None:
+            self.remoto = cliente.ClienteRede(*protocolo.endereco(servidor),
+                                              ao_receber=lambda: pygame.event.post(pygame.event.Event(EVENTO_REDE)))
+        self.mensagens_remotas = deque()
+        self.resultado_remoto = None # Vencedor da rodada segundo o servidor
+        self.estado_remoto = None # Mãos depois da rodada, aplicadas em finalizar_rodada
+        self.oponente_humano = False
         
         self.carregar_assets()
-        self.baralho = Baralho('baralho.json')
         self.criar_menus()
 
-        self.game_state = GameState.TELA_INICIAL
+        # Baralho e bandeiras chegam de threads de carregamento; até lá, tela de progresso
+        self.baralho = None
+        self.carregador = CarregadorAssets()
+        self.iniciar_carregamento(arquivo_baralho)
+
+        self.game_state = GameState.CARREGANDO
         self.dificuldade = Difficulty.NORMAL
         
         # Variáveis de estado do jogo
-        self.mao_jogador, self.mao_ia, self.pilha_empate = [], [], []
+        self.mao_jogador, self.mao_ia, self.pilha_empate = deque(), deque(), deque()
         self.turno_do_jogador = True
         self.atributo_escolhido = None
         self.vencedor_rodada = None
+        self.vencedor_partida = None
+        self.cartas_iniciais = [] # Tamanho de cada mão na distribuição (a IA difícil lembra o que já foi mostrado)
+        self.rodadas = 0
+
+        # Com mais de 2 jogadores: o jogador é o assento 0 de uma motor.PartidaN e as IAs os demais
+        # (um só humano: numa tela compartilhada, cada um veria a carta dos outros)
+        self.n_jogadores = jogadores
+        self.partida_n = None
+        self.assento_vencedor = None # Assento que venceu a rodada (ou EMPATE)
+        if jogadores > 2:
+            self.montar_mesa()
+        self.pensador_ia = None
+        self.decisao_ia = None # Future com o atributo escolhido pela IA difícil
+
+        # Cada partida tem seu próprio RNG; a seed dela (sorteada a partir de `seed`) vai para o replay
+        self.rng_seeds = random.Random(seed)
+        self.rng = random.Random()
+        self.pasta_replays = pasta_replays
+        self.gravador_replay = None
         
         # Variáveis de animação
         self.tempo_estado = 0
         self.anim_progresso = 0
         self.anim_duracao = 0.5 # Duração padrão
 
+        # Renderização: 'completo' redesenha a tela toda a cada quadro; 'sujo' só as regiões que mudaram
+        self.modo_render = modo_render
+        self.redesenhar_tudo = True
+        self.regioes_sujas = []
+        self.rects_animados_anteriores = []
+
+        # Entrada: regiões clicáveis, recalculadas só quando o layout muda
+        self.mapa_cliques = MapaCliques()
+        self.layout_sujo = True
+        self.alvo_hover = None
+        self.atributo_hover = None
+
+        # Contador de tempo por quadro, agrupado por estado
+        self.mostrar_tempos_quadro = mostrar_tempos_quadro
+        self.tempos_quadro = defaultdict(lambda: deque(maxlen=600))
+
+        # Perfil por fase do loop (F3 liga/desliga o overlay, F4 exporta, F5 liga/desliga o cProfile)
+        self.perfil = Perfilador()
+        self.perfil.instrumentar(self, FASES_PERFIL + [nome for nome in dir(Jogo) if nome.startswith(('renderizar_', 'desenhar_', 'animar_'))])
+        self.perfil.adicionar_contador(lambda: self.cache_texto.faltas) # Cada falta é um Font.render
+        self.rect_overlay = None
+        if perfil:
+            self.perfil.ligar()
+
     def carregar_assets(self):
         """ (Melhoria) Centraliza o carregamento de assets. """
+        self.cache_texto = CacheTexto(512)
         self.fontes = {
             'titulo': pygame.font.Font(None, 36),
             'atributo': pygame.font.Font(None, 26),
             'atributo_destaque': pygame.font.Font(None, 28),
             'resultado': pygame.font.Font(None, 90),
             'menu': pygame.font.Font(None, 70),
-            'botao': pygame.font.Font(None, 40)
+            'botao': pygame.font.Font(None, 40),
+            'perfil': pygame.font.Font(None, 20),
         }
         # Placeholder para sons - substitua 'som.wav' pelos seus arquivos
         self.sons = {
@@ -160,6 +278,106 @@ class Jogo:
             'click': None, # pygame.mixer.Sound('assets/sounds/click.wav')
         }
         self.imagem_verso_carta = self.criar_imagem_verso()
+        self.superficie_virada = pygame.Surface((LARGURA_CARTA, ALTURA_CARTA), pygame.SRCALPHA)
+        self.cache_faces = CacheLRU(64)
+        self.cache_miniaturas = CacheLRU(64) # Faces reduzidas dos oponentes (modo com N jogadores)
+
+    def iniciar_carregamento(self, arquivo_json):
+        """ Baralho (validação, binário, índice) e atlas de bandeiras são lidos numa thread; o
+            thread principal só instala os resultados (ver aplicar_carregamento). """
+        futuro_dados = self.carregador.agendar(
+            'baralho', lambda: indice.carregar_baralho(arquivo_json),
+            lambda dados: setattr(self, 'baralho', Baralho(arquivo_json, dados)),
+        )
+        self.carregador.agendar(
+            'bandeiras', lambda: atlas.ler_atlas(arquivo_json, futuro_dados.result().nomes),
+            lambda resultado: self.baralho.instalar_atlas(atlas.recortar(*resultado)),
+        )
+
+    def aplicar_carregamento(self):
+        """ Roda a cada quadro: instala o que as threads terminaram e troca as bandeiras baixadas. """
+        if self.carregador.aplicar_prontos():
+            self.marcar_sujo()
+            if self.carregador.concluido and self.game_state == GameState.CARREGANDO:
+                self.mudar_estado(GameState.TELA_INICIAL)
+                self.registrar_marco('menu pronto')
+        if self.baralho is None:
+            return
+        for carta in self.baralho.atualizar_bandeiras():
+            self.cache_faces.descartar(lambda chave: chave[0] == carta.indice)
+            self.cache_miniaturas.descartar(lambda chave: chave[0] == carta.indice)
+            self.marcar_sujo()
+        if self.carregador.concluido and self.baralho.prefetch.concluido:
+            self.registrar_marco('tudo carregado')
+
+    def esperar_carregamento(self):
+        """ Bloqueia até o fim do carregamento (para usar o Jogo fora do loop principal). """
+        while not self.carregador.concluido:
+            time.sleep(0.001)
+            self.aplicar_carregamento()
+
+    def processar_rede(self):
+        """ Roda a cada quadro no modo em rede: aplica as mensagens do servidor. Uma rodada só é
+            aplicada quando a anterior já foi mostrada, então as que chegam juntas (várias vezes
+            seguidas do oponente) esperam na fila. """
+        if self.remoto is None or self.baralho is None:
+            return
+        self.mensagens_remotas.extend(self.remoto.recebidas())
+        while self.mensagens_remotas:
+            mensagem = self.mensagens_remotas[0]
+            if mensagem is None:
+                print("Conexão com o servidor encerrada.")
+                self.rodando = False
+                return
+            tipo = mensagem['tipo']
+            mostrando_rodada = self.resultado_remoto is not None or self.game_state in (GameState.RESULTADO, GameState.ANIMANDO_FIM_RODADA)
+            if tipo == 'rodada' and (mostrando_rodada or self.game_state != GameState.REVELANDO_CARTA_IA):
+                return
+            if tipo in ('partida', 'fim') and mostrando_rodada:
+                return
+            self.mensagens_remotas.popleft()
+
+            if tipo == 'bem_vindo':
+                if mensagem['assinatura'] != replay.assinatura_baralho(self.baralho.dados):
+                    print("O servidor usa um baralho diferente deste.")
+                    self.rodando = False
+                    return
+            elif tipo == 'aguardando':
+                self.mudar_estado(GameState.AGUARDANDO)
+            elif tipo == 'partida':
+                self.oponente_humano = mensagem['oponente'] == 'humano'
+                self.vencedor_partida = None
+                self.aplicar_estado_remoto(mensagem['estado'])
+            elif tipo == 'rodada':
+                self.mao_ia.topo = self.baralho.cartas[mensagem['cartas'][1]]
+                self.atributo_escolhido = mensagem['atributo']
+                self.resultado_remoto = VENCEDORES_REMOTOS[mensagem['vencedor']]
+                self.estado_remoto = mensagem['estado']
+            elif tipo == 'fim':
+                self.vencedor_partida = VENCEDORES_REMOTOS[mensagem['vencedor']]
+                self.mudar_estado(GameState.FIM_DE_JOGO)
+            elif tipo == 'erro':
+                print(f"Servidor: {mensagem['mensagem']}")
+
+    def aplicar_estado_remoto(self, estado):
+        """ Monta as mãos a partir do estado enviado pelo servidor (a do oponente só com o tamanho). """
+        cartas = self.baralho.cartas
+        self.mao_jogador = deque(cartas[i] for i in estado['mao'])
+        self.mao_ia = cliente.MaoOponente(estado['oponente'])
+        self.pilha_empate = deque(cartas[i] for i in estado['empate'])
+        self.turno_do_jogador = estado['sua_vez']
+        self.atributo_escolhido = None
+        self.vencedor_rodada = None
+        if not self.mao_jogador or not self.mao_ia:
+            self.mudar_estado(GameState.AGUARDANDO) # Fim da partida: falta só a mensagem 'fim'
+        else:
+            self.mudar_estado(GameState.ESCOLHENDO if self.turno_do_jogador else GameState.REVELANDO_CARTA_IA)
+
+    def registrar_marco(self, nome):
+        """ Registra (uma vez) e mostra o tempo desde o início do programa até o marco. """
+        if nome not in self.marcos_inicializacao:
+            decorrido = self.marcos_inicializacao[nome] = time.perf_counter() - self.inicio_execucao
+            print(f"Inicialização: {nome} em {decorrido * 1000:.1f} ms")
 
     def tocar_som(self, nome_som):
         if self.sons.get(nome_som):
@@ -174,29 +392,59 @@ class Jogo:
 
     def criar_menus(self):
         self.botoes_menu = [
-            Botao(LARGURA_TELA/2 - 150, 350, 300, 60, "Fácil", CINZA_ESCURO, VERDE, self.fontes['botao']),
-            Botao(LARGURA_TELA/2 - 150, 420, 300, 60, "Normal", CINZA_ESCURO, AMARELO, self.fontes['botao']),
-            Botao(LARGURA_TELA/2 - 150, 490, 300, 60, "Difícil", CINZA_ESCURO, VERMELHO, self.fontes['botao'])
+            Botao(LARGURA_TELA/2 - 150, 350, 300, 60, "Fácil", CINZA_ESCURO, VERDE, self.fontes['botao'], cache_texto=self.cache_texto),
+            Botao(LARGURA_TELA/2 - 150, 420, 300, 60, "Normal", CINZA_ESCURO, AMARELO, self.fontes['botao'], cache_texto=self.cache_texto),
+            Botao(LARGURA_TELA/2 - 150, 490, 300, 60, "Difícil", CINZA_ESCURO, VERMELHO, self.fontes['botao'], cache_texto=self.cache_texto)
         ]
-        self.botao_jogar_novamente = Botao(LARGURA_TELA/2 - 150, ALTURA_TELA/2 + 100, 300, 60, "Jogar Novamente", AZUL, VERDE, self.fontes['botao'])
+        self.botao_humano = None
+        if self.remoto is not None:
+            self.botao_humano = Botao(LARGURA_TELA/2 - 150, 560, 300, 60, "Contra Humano", CINZA_ESCURO, AZUL, self.fontes['botao'], cache_texto=self.cache_texto)
+            self.botoes_menu.append(self.botao_humano)
+        self.botao_jogar_novamente = Botao(LARGURA_TELA/2 - 150, ALTURA_TELA/2 + 100, 300, 60, "Jogar Novamente", AZUL, VERDE, self.fontes['botao'], cache_texto=self.cache_texto)
 
     def resetar_jogo(self, dificuldade):
         self.dificuldade = dificuldade
-        self.mao_jogador, self.mao_ia = self.baralho.embaralhar_e_distribuir()
-        self.pilha_empate = []
-        self.turno_do_jogador = random.choice([True, False])
+        seed = self.rng_seeds.getrandbits(32)
+        self.rng = random.Random(seed) # Mesma sequência de motor.Partida: distribui e depois sorteia o turno
+        if self.n_jogadores > 2:
+            # As mãos e a pilha são as da partida: as regras de recolher as cartas ficam no motor
+            self.partida_n = motor.PartidaN(self.baralho.cartas, self.n_jogadores, self.rng)
+            self.mao_jogador, self.pilha_empate = self.partida_n.maos[0], self.partida_n.pilha_empate
+            self.turno_do_jogador = self.partida_n.vez == 0
+        else:
+            self.mao_jogador, self.mao_ia = self.baralho.embaralhar_e_distribuir(self.rng)
+            self.pilha_empate = deque()
+            self.turno_do_jogador = self.rng.choice([True, False])
+        self.cartas_iniciais = [len(mao) for mao in self.partida_n.maos] if self.partida_n is not None else [len(self.mao_jogador)]
+        self.rodadas = 0
+        if self.gravador_replay is not None:
+            self.gravador_replay.fechar()
+            self.gravador_replay = None
+        if self.pasta_replays and self.partida_n is None: # O formato de replay é de 2 jogadores
+            self.gravador_replay = replay.GravadorReplay.em_pasta(self.pasta_replays, seed, self.baralho.dados)
         self.atributo_escolhido = None
         self.vencedor_rodada = None
+        self.decisao_ia = None
         self.mudar_estado(GameState.ESCOLHENDO if self.turno_do_jogador else GameState.REVELANDO_CARTA_IA)
 
     def mudar_estado(self, novo_estado):
         self.game_state = novo_estado
-        self.tempo_estado = time.time()
+        self.marcar_sujo()
+        self.layout_sujo = True
+        self.rects_animados_anteriores = []
+        self.tempo_estado = self.relogio.tempo
         self.anim_progresso = 0 # Reseta progresso da animação
         
         # Lógica de transição de estado
         if self.game_state == GameState.REVELANDO_CARTA_IA and not self.turno_do_jogador:
             self.anim_duracao = 1.0 # Duração para a IA "pensar"
+            if self.dificuldade == Difficulty.DIFICIL and self.remoto is None: # A decisão é calculada em outro processo durante a animação
+                ocultas = [ia.cartas_ocultas(n, self.rodadas) for n in self.cartas_iniciais]
+                if self.partida_n is not None:
+                    p = self.partida_n
+                    self.decisao_ia = self.obter_pensador_ia().pedir_n(p.maos, p.vez, p.pilha_empate, self.rng, ocultas)
+                else:
+                    self.decisao_ia = self.obter_pensador_ia().pedir(self.mao_ia, self.mao_jogador, self.pilha_empate, self.rng, ocultas[0])
         elif self.game_state == GameState.RESULTADO:
             self.anim_duracao = 2.0 # Duração para mostrar o resultado
             self.resolver_rodada()
@@ -204,52 +452,168 @@ class Jogo:
             self.anim_duracao = 0.7 # Duração da animação das cartas
             
     def run(self):
+        inicio_wall, inicio_cpu = time.perf_counter(), time.process_time()
         while self.rodando:
+            if self.ocioso():
+                self.esperar_evento()
+                self.relogio.descartar_atraso()
+            inicio_quadro = time.perf_counter()
             self.processar_eventos()
-            self.atualizar_logica()
+            self.aplicar_carregamento()
+            self.processar_rede()
+            for _ in self.relogio.passos():
+                self.atualizar_logica()
+            if self.perfil.ativo and self.rect_overlay is not None:
+                self.marcar_sujo(self.rect_overlay) # O overlay muda a cada quadro
             self.renderizar_tela()
+            self.registrar_marco('primeiro quadro')
+            duracao_quadro = time.perf_counter() - inicio_quadro
+            self.tempos_quadro[self.game_state].append(duracao_quadro)
+            if self.perfil.ativo:
+                self.perfil.fim_quadro(inicio_quadro, duracao_quadro)
             self.clock.tick(60)
+        if self.mostrar_tempos_quadro:
+            uso_cpu = (time.process_time() - inicio_cpu) / (time.perf_counter() - inicio_wall)
+            print(f"Modo de renderização '{self.modo_render}': CPU em {uso_cpu:.0%} de um núcleo")
+            self.imprimir_tempos_quadro()
+        if self.pensador_ia is not None:
+            self.pensador_ia.encerrar()
+        self.carregador.encerrar()
+        if self.gravador_replay is not None:
+            self.gravador_replay.fechar() # Partida interrompida: o replay fica sem a linha final
+        if self.remoto is not None:
+            self.remoto.fechar()
         pygame.quit()
 
-    def processar_eventos(self):
-        mouse_pos = pygame.mouse.get_pos()
-        
-        if self.game_state == GameState.TELA_INICIAL:
-            for i, botao in enumerate(self.botoes_menu):
-                botao.checar_hover(mouse_pos)
-                if botao.foi_clicado(pygame.event.Event(pygame.MOUSEBUTTONDOWN)):
-                    self.tocar_som('click')
-                    dificuldades = [Difficulty.FACIL, Difficulty.NORMAL, Difficulty.DIFICIL]
-                    self.resetar_jogo(dificuldades[i])
-        
-        elif self.game_state == GameState.FIM_DE_JOGO:
-            self.botao_jogar_novamente.checar_hover(mouse_pos)
-            if self.botao_jogar_novamente.foi_clicado(pygame.event.Event(pygame.MOUSEBUTTONDOWN)):
-                self.tocar_som('click')
-                self.mudar_estado(GameState.TELA_INICIAL)
+    def ocioso(self):
+        """ Nada animando nem para redesenhar: dá para dormir até o próximo evento (só no modo 'sujo'). """
+        if self.modo_render != 'sujo' or self.redesenhar_tudo or self.regioes_sujas:
+            return False
+        if self.mensagens_remotas: # Ex.: o 'fim' que esperava a última rodada ser mostrada
+            return False
+        return (self.game_state in (GameState.TELA_INICIAL, GameState.FIM_DE_JOGO, GameState.AGUARDANDO)
+                or (self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador and not self.espectador))
 
+    def esperar_evento(self):
+        # Enquanto ainda chegam bandeiras, acorda de tempos em tempos para trocá-las
+        evento = pygame.event.wait(0 if self.baralho.prefetch.concluido else 250)
+        if evento.type != pygame.NOEVENT:
+            pygame.event.post(evento) # Devolve para processar_eventos tratar normalmente
+
+    def imprimir_tempos_quadro(self):
+        """ Tempo médio de quadro (sem contar a espera do clock) nos últimos quadros de cada estado. """
+        print(f"Cache de faces: {self.cache_faces.acertos} acertos, {self.cache_faces.faltas} faltas")
+        print(f"Cache de texto: {self.cache_texto.acertos} acertos, {self.cache_texto.faltas} faltas")
+        for estado, tempos in self.tempos_quadro.items():
+            print(f"  {estado.name:<20} {sum(tempos) / len(tempos) * 1000:6.2f} ms/quadro ({len(tempos)} quadros)")
+
+    def processar_eventos(self):
+        """ (Refatoração) Só reage a eventos reais; o hit-test usa o mapa de cliques do layout atual. """
+        if self.layout_sujo:
+            self.atualizar_layout()
         for event in pygame.event.get():
+            if self.layout_sujo: # Um clique anterior pode ter mudado o estado neste mesmo quadro
+                self.atualizar_layout()
             if event.type == pygame.QUIT:
                 self.rodando = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador:
-                    for attr, rect in self.areas_clicaveis_jogador.items():
-                        if rect.collidepoint(mouse_pos):
-                            self.tocar_som('click')
-                            self.atributo_escolhido = attr
-                            self.mudar_estado(GameState.REVELANDO_CARTA_IA)
-                            self.anim_duracao = 1.0 # Duração da virada da carta
+            elif event.type == pygame.KEYDOWN:
+                self.tecla_perfil(event.key)
+            elif event.type == pygame.MOUSEMOTION:
+                self.atualizar_hover(event.pos)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.clicar(self.mapa_cliques.alvo_em(event.pos))
+
+    def tecla_perfil(self, tecla):
+        if tecla == pygame.K_F3:
+            self.perfil.alternar()
+            self.rect_overlay = None
+            self.marcar_sujo()
+        elif tecla == pygame.K_F4 and self.perfil.ativo:
+            print("Perfil exportado em " + " e ".join(self.perfil.exportar()))
+        elif tecla == pygame.K_F5:
+            caminho = self.perfil.alternar_cprofile()
+            print(f"cProfile gravado em {caminho}" if caminho else "cProfile ligado (F5 de novo para gravar)")
+
+    def atualizar_layout(self):
+        """ Recalcula as regiões clicáveis do estado atual (só quando o layout muda). """
+        self.layout_sujo = False
+        self.mapa_cliques.limpar()
+
+        if self.game_state == GameState.TELA_INICIAL:
+            for botao in self.botoes_menu:
+                self.mapa_cliques.adicionar(botao.rect, botao)
+        elif self.game_state == GameState.FIM_DE_JOGO:
+            self.mapa_cliques.adicionar(self.botao_jogar_novamente.rect, self.botao_jogar_novamente)
+        elif self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador:
+            x, y = POS_CARTA_JOGADOR
+            _, areas = self.face_carta(self.mao_jogador[0])
+            for nome_attr, rect in areas.items():
+                self.mapa_cliques.adicionar(pygame.Rect(x + 20, y + rect.y, LARGURA_CARTA - 40, 28), nome_attr)
+
+        self.atualizar_hover(pygame.mouse.get_pos())
+
+    def atualizar_hover(self, pos_mouse):
+        alvo = self.mapa_cliques.alvo_em(pos_mouse)
+        if alvo is self.alvo_hover:
+            return
+        for alvo_alterado, em_hover in ((self.alvo_hover, False), (alvo, True)):
+            if isinstance(alvo_alterado, Botao):
+                alvo_alterado.is_hovering = em_hover
+                self.marcar_sujo(alvo_alterado.rect)
+            elif alvo_alterado is not None: # Atributo da carta do jogador
+                self.marcar_sujo(pygame.Rect(POS_CARTA_JOGADOR, (LARGURA_CARTA, ALTURA_CARTA)))
+        self.alvo_hover = alvo
+        self.atributo_hover = None if isinstance(alvo, Botao) else alvo
+
+    def clicar(self, alvo):
+        if alvo is None:
+            return
+        self.tocar_som('click')
+        if alvo is self.botao_humano:
+            self.remoto.enviar(tipo='entrar', oponente='humano')
+            self.mudar_estado(GameState.AGUARDANDO)
+        elif alvo in self.botoes_menu:
+            dificuldades = [Difficulty.FACIL, Difficulty.NORMAL, Difficulty.DIFICIL]
+            dificuldade = dificuldades[self.botoes_menu.index(alvo)]
+            if self.remoto is not None:
+                self.dificuldade = dificuldade
+                self.remoto.enviar(tipo='entrar', oponente='ia', dificuldade=dificuldade.name)
+                self.mudar_estado(GameState.AGUARDANDO)
+            else:
+                self.resetar_jogo(dificuldade)
+        elif alvo is self.botao_jogar_novamente:
+            self.mudar_estado(GameState.TELA_INICIAL)
+        else: # Atributo escolhido na carta do jogador
+            self.escolher_atributo_jogador(alvo)
+
+    def escolher_atributo_jogador(self, atributo):
+        self.atributo_escolhido = atributo
+        if self.remoto is not None:
+            self.remoto.enviar(tipo='escolher', atributo=atributo)
+        self.mudar_estado(GameState.REVELANDO_CARTA_IA)
+        self.anim_duracao = 1.0 # Duração da virada da carta
 
     def atualizar_logica(self):
-        """ (Refatoração) Máquina de estados principal para a lógica. """
-        delta_tempo = time.time() - self.tempo_estado
+        """ (Refatoração) Máquina de estados principal para a lógica. Roda uma vez por passo do relógio. """
+        if self.relogio.instantaneo:
+            delta_tempo = float('inf') # Pula todas as durações de animação
+        else:
+            delta_tempo = self.relogio.tempo - self.tempo_estado
         
+        # Modo espectador: a IA também escolhe pelo jogador
+        if self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador and self.espectador:
+            self.escolher_atributo_jogador(motor.escolher_atributo(self.mao_jogador[0], self.dificuldade, self.rng))
+
         # Animação de virar a carta da IA
-        if self.game_state == GameState.REVELANDO_CARTA_IA:
-            self.anim_progresso = min(delta_tempo / self.anim_duracao, 1.0)
+        elif self.game_state == GameState.REVELANDO_CARTA_IA:
+            # Em rede, a carta do oponente só termina de virar depois que o resultado chega
+            esperando_servidor = self.remoto is not None and self.resultado_remoto is None
+            self.anim_progresso = min(delta_tempo / self.anim_duracao, 0.5 if esperando_servidor else 1.0)
             if self.anim_progresso >= 1.0:
                 # Se era turno da IA, ela escolhe o atributo agora
-                if not self.turno_do_jogador:
+                if not self.turno_do_jogador and self.remoto is None:
+                    if self.decisao_ia is not None and not self.decisao_ia.done():
+                        return # Espera o processo da IA sem travar a renderização
                     self.atributo_escolhido = self.ia_escolhe_atributo()
                 self.mudar_estado(GameState.RESULTADO)
 
@@ -264,21 +628,86 @@ class Jogo:
 
     def renderizar_tela(self):
         """ (Refatoração) Máquina de estados principal para a renderização. """
+        if self.modo_render == 'sujo':
+            self.renderizar_regioes_sujas()
+            return
+
         self.tela.fill(CINZA_ESCURO)
+        self.desenhar_cena()
+        pygame.display.flip()
+        self.redesenhar_tudo, self.regioes_sujas = False, []
 
-        if self.game_state == GameState.TELA_INICIAL:
+    def desenhar_cena(self):
+        if self.game_state == GameState.CARREGANDO:
+            self.renderizar_carregamento()
+        elif self.game_state == GameState.TELA_INICIAL:
             self.renderizar_menu_inicial()
         elif self.game_state == GameState.FIM_DE_JOGO:
             self.renderizar_fim_de_jogo()
+        elif self.game_state == GameState.AGUARDANDO:
+            self.desenhar_texto(self.tela, "Aguardando oponente...", (LARGURA_TELA/2, ALTURA_TELA/2), self.fontes['titulo'], BRANCO, center=True)
         else: # Estados de jogo ativo
             self.renderizar_hud()
             self.renderizar_cartas()
             self.renderizar_feedback_estados()
+        if self.perfil.ativo:
+            self.rect_overlay = self.perfil.desenhar_overlay(self.tela, self.fontes['perfil'])
 
-        pygame.display.flip()
+    # --- Renderização por Regiões Sujas (Otimização) ---
+
+    def marcar_sujo(self, rect=None):
+        """ Marca uma região para ser redesenhada no próximo quadro (None = tela inteira). """
+        if rect is None:
+            self.redesenhar_tudo = True
+        else:
+            self.regioes_sujas.append(rect)
+
+    def regioes_dinamicas(self):
+        """ Regiões que mudam a cada quadro no estado atual, mesmo sem eventos. """
+        if self.partida_n is not None and self.game_state in (GameState.REVELANDO_CARTA_IA, GameState.ANIMANDO_FIM_RODADA):
+            return [self.tela.get_rect()] # Com N jogadores, as cartas se espalham pela mesa inteira
+        if self.game_state == GameState.REVELANDO_CARTA_IA:
+            return [pygame.Rect(POS_CARTA_IA, (LARGURA_CARTA, ALTURA_CARTA))]
+        if self.game_state == GameState.ANIMANDO_FIM_RODADA:
+            # Apaga onde as cartas estavam no quadro anterior e desenha onde estão agora
+            atuais = [pygame.Rect(pos, (LARGURA_CARTA, ALTURA_CARTA)) for pos in self.posicoes_cartas_fim_rodada()]
+            regioes, self.rects_animados_anteriores = self.rects_animados_anteriores + atuais, atuais
+            return regioes
+        return []
+
+    def renderizar_regioes_sujas(self):
+        regioes = self.regioes_sujas + self.regioes_dinamicas()
+        self.regioes_sujas = []
+
+        if self.redesenhar_tudo:
+            self.redesenhar_tudo = False
+            self.tela.fill(CINZA_ESCURO)
+            self.desenhar_cena()
+            pygame.display.flip()
+            return
+        if not regioes:
+            return
+
+        area = regioes[0].unionall(regioes[1:]).clip(self.tela.get_rect())
+        self.tela.set_clip(area)
+        self.tela.fill(CINZA_ESCURO, area)
+        self.desenhar_cena()
+        self.tela.set_clip(None)
+        pygame.display.update(area)
 
     # --- Funções de Renderização Específicas ---
     
+    def renderizar_carregamento(self):
+        self.desenhar_texto(self.tela, "Super Trunfo: Países", (LARGURA_TELA/2, 150), self.fontes['menu'], AMARELO, center=True)
+        barra = pygame.Rect(0, 0, 400, 24)
+        barra.center = (LARGURA_TELA/2, ALTURA_TELA/2)
+        pygame.draw.rect(self.tela, CINZA_CLARO, barra, 2, border_radius=6)
+        preenchida = barra.inflate(-8, -8)
+        preenchida.width = int(preenchida.width * self.carregador.progresso)
+        if preenchida.width > 0:
+            pygame.draw.rect(self.tela, VERDE, preenchida, border_radius=4)
+        self.desenhar_texto(self.tela, f"Carregando {self.carregador.etapa_atual or ''}...", (LARGURA_TELA/2, ALTURA_TELA/2 + 40), self.fontes['atributo'], BRANCO, center=True)
+
     def renderizar_menu_inicial(self):
         self.desenhar_texto(self.tela, "Super Trunfo: Países", (LARGURA_TELA/2, 150), self.fontes['menu'], AMARELO, center=True)
         self.desenhar_texto(self.tela, "Escolha a Dificuldade:", (LARGURA_TELA/2, 280), self.fontes['titulo'], BRANCO, center=True)
@@ -286,18 +715,32 @@ class Jogo:
             botao.desenhar(self.tela)
 
     def renderizar_fim_de_jogo(self):
-        vencedor_final = "VOCÊ GANHOU O JOGO!" if self.mao_jogador else "A IA GANHOU O JOGO!"
-        cor_final = VERDE if self.mao_jogador else VERMELHO
+        if self.vencedor_partida == motor.JOGADOR: vencedor_final, cor_final = "VOCÊ GANHOU O JOGO!", VERDE
+        elif self.vencedor_partida == motor.IA:
+            if self.oponente_humano:
+                quem = 'O OPONENTE'
+            elif self.partida_n is not None:
+                quem = f'A IA {self.partida_n.vencedor}'
+            else:
+                quem = 'A IA'
+            vencedor_final, cor_final = f"{quem} GANHOU O JOGO!", VERMELHO
+        else: vencedor_final, cor_final = "EMPATE!", AMARELO
         self.desenhar_texto(self.tela, vencedor_final, (LARGURA_TELA/2, ALTURA_TELA/2 - 50), self.fontes['resultado'], cor_final, center=True)
         self.botao_jogar_novamente.desenhar(self.tela)
 
     def renderizar_hud(self):
+        if self.partida_n is not None:
+            self.renderizar_hud_n()
+            return
         self.desenhar_texto(self.tela, f"Suas Cartas: {len(self.mao_jogador)}", (POS_CARTA_JOGADOR[0], POS_CARTA_JOGADOR[1] - 40), self.fontes['atributo_destaque'])
-        self.desenhar_texto(self.tela, f"Cartas da IA: {len(self.mao_ia)}", (POS_CARTA_IA[0], POS_CARTA_IA[1] - 40), self.fontes['atributo_destaque'])
+        self.desenhar_texto(self.tela, f"Cartas {'do Oponente' if self.oponente_humano else 'da IA'}: {len(self.mao_ia)}", (POS_CARTA_IA[0], POS_CARTA_IA[1] - 40), self.fontes['atributo_destaque'])
         if self.pilha_empate:
             self.desenhar_texto(self.tela, f"Pilha de Empate: {len(self.pilha_empate)}", (LARGURA_TELA/2, 40), self.fontes['atributo_destaque'], AMARELO, center=True)
 
     def renderizar_cartas(self):
+        if self.partida_n is not None:
+            self.renderizar_cartas_n()
+            return
         carta_j = self.mao_jogador[0]
         carta_i = self.mao_ia[0]
         
@@ -305,7 +748,7 @@ class Jogo:
             self.animar_cartas_fim_rodada(carta_j, carta_i)
         else:
             # Carta do Jogador
-            self.areas_clicaveis_jogador = self.desenhar_carta(self.tela, carta_j, POS_CARTA_JOGADOR, turno_oponente=(not self.turno_do_jogador))
+            self.desenhar_carta(self.tela, carta_j, POS_CARTA_JOGADOR, turno_oponente=(not self.turno_do_jogador), atributo_hover=self.atributo_hover)
             
             # Carta da IA
             if self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador:
@@ -317,10 +760,13 @@ class Jogo:
 
     def renderizar_feedback_estados(self):
         if self.game_state == GameState.REVELANDO_CARTA_IA and not self.turno_do_jogador:
-             self.desenhar_texto(self.tela, "IA está escolhendo...", (LARGURA_TELA/2, 60), self.fontes['titulo'], AMARELO, center=True)
+             quem = 'Oponente' if self.oponente_humano else f'IA {self.partida_n.vez}' if self.partida_n is not None else 'IA'
+             self.desenhar_texto(self.tela, f"{quem} está escolhendo...", (LARGURA_TELA/2, 60), self.fontes['titulo'], AMARELO, center=True)
         
         if self.game_state == GameState.RESULTADO:
             if self.vencedor_rodada == 'JOGADOR': texto, cor = "VOCÊ VENCEU!", VERDE
+            elif self.vencedor_rodada == 'IA' and self.partida_n is not None and not self.mao_jogador: # Eliminado: só assiste às IAs
+                texto, cor = f"IA {self.assento_vencedor} VENCEU!", BRANCO
             elif self.vencedor_rodada == 'IA': texto, cor = "VOCÊ PERDEU!", VERMELHO
             else: texto, cor = "EMPATE!", AMARELO
             self.desenhar_texto(self.tela, texto, (LARGURA_TELA/2, ALTURA_TELA/2 - 80), self.fontes['resultado'], cor, center=True)
@@ -329,6 +775,9 @@ class Jogo:
     def renderizar_comparacao_atributo(self):
         """ (Nova Funcionalidade) Mostra a comparação de valores. """
         if not self.atributo_escolhido: return
+        if self.partida_n is not None:
+            self.renderizar_comparacao_n()
+            return
 
         carta_j = self.mao_jogador[0]
         carta_i = self.mao_ia[0]
@@ -364,18 +813,22 @@ class Jogo:
 
         if progresso < 0: # Mostra o verso
             imagem_para_desenhar = self.imagem_verso_carta
-        else: # Mostra a frente
-            # Recria a superfície da carta para desenhar
-            surf_frente = pygame.Surface((LARGURA_CARTA, ALTURA_CARTA), pygame.SRCALPHA)
-            self.desenhar_carta(surf_frente, carta_ia, (0,0), atributo_selecionado=self.atributo_escolhido)
-            imagem_para_desenhar = surf_frente
+        else: # Mostra a frente (já renderizada, vem do cache)
+            imagem_para_desenhar, _ = self.face_carta(carta_ia, self.atributo_escolhido)
         
-        imagem_redimensionada = pygame.transform.scale(imagem_para_desenhar, (largura_animada, ALTURA_CARTA))
+        # Redimensiona dentro de uma superfície reutilizada, sem alocar uma nova a cada quadro
+        destino = self.superficie_virada.subsurface((0, 0, largura_animada, ALTURA_CARTA))
+        pygame.transform.scale(imagem_para_desenhar, (largura_animada, ALTURA_CARTA), destino)
         pos_x_centralizado = POS_CARTA_IA[0] + (LARGURA_CARTA - largura_animada) / 2
         
-        self.tela.blit(imagem_redimensionada, (pos_x_centralizado, POS_CARTA_IA[1]))
+        self.tela.blit(destino, (pos_x_centralizado, POS_CARTA_IA[1]))
     
     def animar_cartas_fim_rodada(self, carta_j, carta_i):
+        pos_j, pos_i = self.posicoes_cartas_fim_rodada()
+        self.desenhar_carta(self.tela, carta_j, pos_j, atributo_selecionado=self.atributo_escolhido)
+        self.desenhar_carta(self.tela, carta_i, pos_i, atributo_selecionado=self.atributo_escolhido)
+
+    def posicoes_cartas_fim_rodada(self):
         progresso = self.ease_in_out_quad(self.anim_progresso)
         
         start_j, start_i = POS_CARTA_JOGADOR, POS_CARTA_IA
@@ -396,36 +849,139 @@ class Jogo:
         pos_i_x = start_i[0] + (end_i[0] - start_i[0]) * progresso
         pos_i_y = start_i[1] + (end_i[1] - start_i[1]) * progresso
 
-        self.desenhar_carta(self.tela, carta_j, (pos_j_x, pos_j_y), atributo_selecionado=self.atributo_escolhido)
-        self.desenhar_carta(self.tela, carta_i, (pos_i_x, pos_i_y), atributo_selecionado=self.atributo_escolhido)
+        return (pos_j_x, pos_j_y), (pos_i_x, pos_i_y)
+
+    # --- Mesa com N jogadores ---
+
+    def montar_mesa(self):
+        """ Posições das cartas dos oponentes (assentos 1..N-1), numa grade dentro de AREA_OPONENTES,
+            em tamanho reduzido para caberem todas. """
+        n_oponentes = self.n_jogadores - 1
+        colunas = 2 if n_oponentes <= 4 else 3 if n_oponentes <= 6 else 4
+        linhas = -(-n_oponentes // colunas)
+        largura_slot, altura_slot = AREA_OPONENTES.width // colunas, AREA_OPONENTES.height // linhas
+        largura = max(1, int(min(largura_slot - 20, (altura_slot - 60) * LARGURA_CARTA / ALTURA_CARTA)))
+        self.tamanho_mini = (largura, max(1, int(largura * ALTURA_CARTA / LARGURA_CARTA)))
+        self.posicoes_oponentes = {}
+        for i in range(n_oponentes):
+            linha, coluna = divmod(i, colunas)
+            self.posicoes_oponentes[i + 1] = (AREA_OPONENTES.x + coluna * largura_slot + (largura_slot - largura) // 2,
+                                              AREA_OPONENTES.y + linha * altura_slot + 30)
+        self.imagem_verso_mini = pygame.transform.smoothscale(self.imagem_verso_carta, self.tamanho_mini)
+        self.superficie_virada_mini = pygame.Surface(self.tamanho_mini, pygame.SRCALPHA)
+
+    def mesa(self):
+        """ (assento, carta do topo) de cada jogador ainda na partida. """
+        maos = self.partida_n.maos
+        return [(assento, maos[assento][0]) for assento in self.partida_n.ativos]
+
+    def miniatura(self, carta, atributo_selecionado=None):
+        """ Face reduzida da carta de um oponente, via cache LRU. """
+        return self.cache_miniaturas.obter((carta.indice, atributo_selecionado),
+                                           lambda: pygame.transform.smoothscale(self.face_carta(carta, atributo_selecionado)[0], self.tamanho_mini))
+
+    def renderizar_hud_n(self):
+        maos, vez = self.partida_n.maos, self.partida_n.vez
+        texto = f"Suas Cartas: {len(self.mao_jogador)}" if self.mao_jogador else "Você foi eliminado"
+        self.desenhar_texto(self.tela, texto, (POS_CARTA_JOGADOR[0], POS_CARTA_JOGADOR[1] - 40), self.fontes['atributo_destaque'], AMARELO if vez == 0 else BRANCO)
+        for assento, (x, y) in self.posicoes_oponentes.items():
+            texto = f"IA {assento}: {len(maos[assento])}" if maos[assento] else f"IA {assento}: fora"
+            cor = AMARELO if assento == vez else BRANCO if maos[assento] else CINZA_CLARO
+            self.desenhar_texto(self.tela, texto, (x + self.tamanho_mini[0] / 2, y - 15), self.fontes['atributo'], cor, center=True)
+        if self.pilha_empate:
+            self.desenhar_texto(self.tela, f"Pilha de Empate: {len(self.pilha_empate)}", (LARGURA_TELA/2, 40), self.fontes['atributo_destaque'], AMARELO, center=True)
+
+    def renderizar_cartas_n(self):
+        if self.game_state == GameState.ANIMANDO_FIM_RODADA:
+            for (assento, carta), pos in zip(self.mesa(), self.posicoes_cartas_fim_rodada_n()):
+                if assento == 0:
+                    self.desenhar_carta(self.tela, carta, pos, atributo_selecionado=self.atributo_escolhido)
+                else:
+                    self.tela.blit(self.miniatura(carta, self.atributo_escolhido), pos)
+            return
+
+        if self.mao_jogador:
+            self.desenhar_carta(self.tela, self.mao_jogador[0], POS_CARTA_JOGADOR, turno_oponente=(not self.turno_do_jogador), atributo_hover=self.atributo_hover)
+        for assento, carta in self.mesa():
+            if assento == 0:
+                continue
+            pos = self.posicoes_oponentes[assento]
+            if self.game_state == GameState.ESCOLHENDO and self.turno_do_jogador:
+                self.tela.blit(self.imagem_verso_mini, pos)
+            elif self.game_state == GameState.REVELANDO_CARTA_IA:
+                self.animar_virada_mini(carta, pos)
+            else:
+                self.tela.blit(self.miniatura(carta, self.atributo_escolhido), pos)
+
+    def animar_virada_mini(self, carta, pos):
+        """ Como animar_virada_carta, para as cartas reduzidas: todas viram juntas. """
+        progresso = self.anim_progresso * 2 - 1
+        largura, altura = self.tamanho_mini
+        largura_animada = int(largura * abs(progresso))
+        if largura_animada == 0: return
+
+        imagem = self.imagem_verso_mini if progresso < 0 else self.miniatura(carta, self.atributo_escolhido)
+        destino = self.superficie_virada_mini.subsurface((0, 0, largura_animada, altura))
+        pygame.transform.scale(imagem, (largura_animada, altura), destino)
+        self.tela.blit(destino, (pos[0] + (largura - largura_animada) / 2, pos[1]))
+
+    def posicoes_cartas_fim_rodada_n(self):
+        """ Posição atual de cada carta da mesa (na ordem de mesa()) indo para quem venceu a rodada. """
+        progresso = self.ease_in_out_quad(self.anim_progresso)
+        vencedor = self.assento_vencedor
+        if vencedor == motor.EMPATE:
+            fim = (LARGURA_TELA/2, -ALTURA_CARTA - 50)
+        elif vencedor == 0:
+            fim = (POS_CARTA_JOGADOR[0], ALTURA_TELA + 50)
+        else:
+            fim = self.posicoes_oponentes[vencedor]
+        posicoes = []
+        for assento, _ in self.mesa():
+            inicio = POS_CARTA_JOGADOR if assento == 0 else self.posicoes_oponentes[assento]
+            posicoes.append((inicio[0] + (fim[0] - inicio[0]) * progresso, inicio[1] + (fim[1] - inicio[1]) * progresso))
+        return posicoes
+
+    def renderizar_comparacao_n(self):
+        """ Valor do atributo de cada carta embaixo dela, com o vencedor em verde. """
+        self.desenhar_texto(self.tela, self.atributo_escolhido.replace('_', ' ').title(), (LARGURA_TELA/2, 75), self.fontes['titulo'], BRANCO, center=True)
+        for assento, carta in self.mesa():
+            if assento == 0:
+                x, y = POS_CARTA_JOGADOR[0] + LARGURA_CARTA / 2, POS_CARTA_JOGADOR[1] + ALTURA_CARTA + 25
+            else:
+                x, y = self.posicoes_oponentes[assento]
+                x, y = x + self.tamanho_mini[0] / 2, y + self.tamanho_mini[1] + 15
+            cor = VERDE if assento == self.assento_vencedor else AMARELO if self.assento_vencedor == motor.EMPATE else BRANCO
+            self.desenhar_texto(self.tela, str(carta.obter_valor_atributo(self.atributo_escolhido)), (x, y), self.fontes['atributo_destaque'], cor, center=True)
 
     # --- Funções de Lógica ---
     
     def ia_escolhe_atributo(self):
-        """ (Melhoria) IA com níveis de dificuldade. """
-        carta_ia = self.mao_ia[0]
-        if self.dificuldade == Difficulty.FACIL:
-            return random.choice(list(carta_ia.atributos.keys()))
-        
-        # Dificuldade Normal e Difícil (pode ser expandida)
-        # Para Difícil, uma estratégia seria analisar os valores médios, etc.
-        # Por simplicidade, Normal e Difícil usarão a melhor escolha.
-        return max(carta_ia.atributos, key=carta_ia.atributos.get)
+        """ (Melhoria) IA com níveis de dificuldade. A difícil usa a decisão vinda do PensadorIA. """
+        if self.decisao_ia is not None:
+            decisao, self.decisao_ia = self.decisao_ia, None
+            return decisao.result()
+        carta = self.partida_n.maos[self.partida_n.vez][0] if self.partida_n is not None else self.mao_ia[0]
+        return motor.escolher_atributo(carta, self.dificuldade, self.rng)
 
-    def resolver_rodada(self):
-        carta_j = self.mao_jogador[0]
-        carta_i = self.mao_ia[0]
+    def obter_pensador_ia(self):
+        """ O processo da IA difícil só é criado quando ela é usada pela primeira vez. """
+        if self.pensador_ia is None:
+            self.pensador_ia = ia.PensadorIA(self.baralho.dados)
+        return self.pensador_ia
 
-        if carta_j.super_trunfo and not carta_i.anti_trunfo: self.vencedor_rodada = 'JOGADOR'
-        elif carta_i.super_trunfo and not carta_j.anti_trunfo: self.vencedor_rodada = 'IA'
-        elif carta_j.super_trunfo and carta_i.anti_trunfo: self.vencedor_rodada = 'IA' # Anti-trunfo vence
-        elif carta_i.super_trunfo and carta_j.anti_trunfo: self.vencedor_rodada = 'JOGADOR' # Anti-trunfo vence
+    def resolver_rodada(self):
+        if self.remoto is not None:
+            self.vencedor_rodada, self.resultado_remoto = self.resultado_remoto, None
+        elif self.partida_n is not None:
+            # Só decide; as cartas são recolhidas pela partida em finalizar_rodada, depois da animação
+            assentos, cartas = zip(*self.mesa())
+            posicao = motor.resolver_confronto_n(cartas, self.atributo_escolhido)
+            self.assento_vencedor = motor.EMPATE if posicao is None else assentos[posicao]
+            self.vencedor_rodada = {motor.EMPATE: motor.EMPATE, 0: motor.JOGADOR}.get(self.assento_vencedor, motor.IA)
         else:
-            valor_j = carta_j.obter_valor_atributo(self.atributo_escolhido)
-            valor_i = carta_i.obter_valor_atributo(self.atributo_escolhido)
-            if valor_j > valor_i: self.vencedor_rodada = 'JOGADOR'
-            elif valor_i > valor_j: self.vencedor_rodada = 'IA'
-            else: self.vencedor_rodada = 'EMPATE'
+            self.vencedor_rodada = motor.resolver_confronto(self.mao_jogador[0], self.mao_ia[0], self.atributo_escolhido)
+        if self.gravador_replay is not None:
+            self.gravador_replay.rodada(self.atributo_escolhido, self.vencedor_rodada)
         
         # Tocar som com base no resultado
         if self.vencedor_rodada == 'JOGADOR': self.tocar_som('vitoria')
@@ -434,33 +990,43 @@ class Jogo:
 
     def finalizar_rodada(self):
         """ Atualiza as mãos após a animação de fim de rodada. """
-        carta_j = self.mao_jogador.pop(0)
-        carta_i = self.mao_ia.pop(0)
-        
-        cartas_da_rodada = [carta_j, carta_i] + self.pilha_empate
-        self.pilha_empate.clear()
-
-        if self.vencedor_rodada == 'JOGADOR':
-            self.mao_jogador.extend(cartas_da_rodada)
-            self.turno_do_jogador = True
-        elif self.vencedor_rodada == 'IA':
-            self.mao_ia.extend(cartas_da_rodada)
-            self.turno_do_jogador = False
-        else: # EMPATE
-            self.pilha_empate.extend(cartas_da_rodada)
-            # O turno não muda em caso de empate
+        if self.remoto is not None: # As mãos já vieram do servidor junto com o resultado
+            self.aplicar_estado_remoto(self.estado_remoto)
+            return
+        self.rodadas += 1
+        if self.partida_n is not None:
+            self.finalizar_rodada_n()
+            return
+        turno = motor.recolher_cartas(self.vencedor_rodada, self.mao_jogador, self.mao_ia, self.pilha_empate)
+        if turno is not None: # O turno não muda em caso de empate
+            self.turno_do_jogador = turno
         
         self.atributo_escolhido = None
 
         if not self.mao_jogador or not self.mao_ia:
+            self.vencedor_partida = motor.vencedor_partida(self.mao_jogador, self.mao_ia) # None: um empate esvaziou as duas mãos
+            if self.gravador_replay is not None:
+                self.gravador_replay.fim(self.vencedor_partida)
+                self.gravador_replay = None
             self.mudar_estado(GameState.FIM_DE_JOGO)
         else:
             novo_estado = GameState.ESCOLHENDO if self.turno_do_jogador else GameState.REVELANDO_CARTA_IA
             self.mudar_estado(novo_estado)
 
+    def finalizar_rodada_n(self):
+        self.partida_n.jogar_rodada(self.atributo_escolhido)
+        self.turno_do_jogador = self.partida_n.vez == 0
+        self.atributo_escolhido = None
+        if self.partida_n.terminou:
+            vencedor = self.partida_n.vencedor
+            self.vencedor_partida = motor.JOGADOR if vencedor == 0 else motor.IA if vencedor is not None else None
+            self.mudar_estado(GameState.FIM_DE_JOGO)
+        else:
+            self.mudar_estado(GameState.ESCOLHENDO if self.turno_do_jogador else GameState.REVELANDO_CARTA_IA)
+
     # --- Funções de Desenho ---
     def desenhar_texto(self, surface, texto, pos, fonte, cor=BRANCO, center=False):
-        texto_surface = fonte.render(texto, True, cor)
+        texto_surface = self.cache_texto.renderizar(fonte, texto, cor)
         if center:
             texto_rect = texto_surface.get_rect(center=pos)
             surface.blit(texto_surface, texto_rect)
@@ -468,51 +1034,84 @@ class Jogo:
             surface.blit(texto_surface, pos)
         return texto_surface.get_rect(topleft=pos)
 
-    def desenhar_carta(self, surface, carta, pos, escondida=False, atributo_selecionado=None, turno_oponente=False):
+    def desenhar_carta(self, surface, carta, pos, escondida=False, atributo_selecionado=None, turno_oponente=False, atributo_hover=None):
         x, y = pos
         if escondida:
             surface.blit(self.imagem_verso_carta, pos)
             return {}
 
-        retangulo_carta = pygame.Rect(x, y, LARGURA_CARTA, ALTURA_CARTA)
+        # A face vem pronta do cache; só o hover do mouse é desenhado por cima
+        face, areas = self.face_carta(carta, atributo_selecionado, turno_oponente)
+        surface.blit(face, pos)
+        areas_clicaveis = {nome_attr: rect.move(x, y) for nome_attr, rect in areas.items()}
+
+        if atributo_hover in areas_clicaveis and atributo_hover != atributo_selecionado:
+            rect = areas_clicaveis[atributo_hover]
+            pygame.draw.rect(surface, BRANCO, rect)
+            self.desenhar_texto(surface, self.texto_atributo(carta, atributo_hover), rect.topleft, self.fontes['atributo'], AZUL)
+        
+        return areas_clicaveis
+
+    def face_carta(self, carta, atributo_selecionado=None, turno_oponente=False):
+        """ (Otimização) Retorna (superfície, áreas clicáveis relativas) da carta, via cache LRU. """
+        chave = (carta.indice, atributo_selecionado, turno_oponente)
+        return self.cache_faces.obter(chave, lambda: self.renderizar_face_carta(carta, atributo_selecionado, turno_oponente))
+
+    def renderizar_face_carta(self, carta, atributo_selecionado, turno_oponente):
+        surface = pygame.Surface((LARGURA_CARTA, ALTURA_CARTA), pygame.SRCALPHA)
+        retangulo_carta = surface.get_rect()
         cor_borda = AMARELO if turno_oponente else PRETO
         
         pygame.draw.rect(surface, BRANCO, retangulo_carta, border_radius=15)
         pygame.draw.rect(surface, cor_borda, retangulo_carta, 4, border_radius=15)
         
-        self.desenhar_texto(surface, carta.nome, (x + 20, y + 15), self.fontes['titulo'], PRETO)
-        surface.blit(carta.imagem_bandeira, (x + 20, y + 60))
-        
-        pos_y_atributo, areas_clicaveis = y + 220, {}
-        mouse_pos = pygame.mouse.get_pos()
+        self.desenhar_texto(surface, carta.nome, (20, 15), self.fontes['titulo'], PRETO)
+        surface.blit(carta.imagem_bandeira, (20, 60))
         
-        for nome_attr, valor_attr in carta.atributos.items():
-            cor_texto = PRETO
-            is_hovering = False
-
-            # Lógica de highlight
-            if self.turno_do_jogador and self.game_state == GameState.ESCOLHENDO:
-                temp_rect = pygame.Rect(x + 20, pos_y_atributo, LARGURA_CARTA - 40, 28)
-                if temp_rect.collidepoint(mouse_pos):
-                    cor_texto = AZUL
-                    is_hovering = True
-
-            if nome_attr == atributo_selecionado:
-                cor_texto = VERDE if not is_hovering else (60, 255, 60)
-
-            texto_renderizado = f"{nome_attr.replace('_', ' ').title()}: {valor_attr}"
-            rect_atributo = self.desenhar_texto(surface, texto_renderizado, (x + 20, pos_y_atributo), self.fontes['atributo'], cor_texto)
+        pos_y_atributo, areas_clicaveis = 220, {}
+        for nome_attr in carta.atributos:
+            cor_texto = VERDE if nome_attr == atributo_selecionado else PRETO
+            rect_atributo = self.desenhar_texto(surface, self.texto_atributo(carta, nome_attr), (20, pos_y_atributo), self.fontes['atributo'], cor_texto)
             areas_clicaveis[nome_attr] = rect_atributo
             pos_y_atributo += 28
 
         if carta.super_trunfo:
-            self.desenhar_texto(surface, "SUPER TRUNFO", (x + LARGURA_CARTA/2, y + ALTURA_CARTA - 40), self.fontes['atributo_destaque'], VERMELHO, center=True)
+            self.desenhar_texto(surface, "SUPER TRUNFO", (LARGURA_CARTA/2, ALTURA_CARTA - 40), self.fontes['atributo_destaque'], VERMELHO, center=True)
         elif carta.anti_trunfo:
-            self.desenhar_texto(surface, "ANTI-TRUNFO", (x + LARGURA_CARTA/2, y + ALTURA_CARTA - 40), self.fontes['atributo_destaque'], AZUL, center=True)
+            self.desenhar_texto(surface, "ANTI-TRUNFO", (LARGURA_CARTA/2, ALTURA_CARTA - 40), self.fontes['atributo_destaque'], AZUL, center=True)
         
-        return areas_clicaveis
+        return surface, areas_clicaveis
+
+    def texto_atributo(self, carta, nome_attr):
+        return f"{nome_attr.replace('_', ' ').title()}: {carta.obter_valor_atributo(nome_attr)}"
 
 # --- PONTO DE ENTRADA ---
 if __name__ == "__main__":
-    jogo = Jogo()
-    jogo.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Super Trunfo - Países")
+    parser.add_argument('--tempos-quadro', action='store_true', help="Mostra uso de CPU e tempo médio de quadro por estado ao sair")
+    parser.add_argument('--render', choices=['completo', 'sujo'], default='completo',
+                        help="'completo' redesenha tudo a cada quadro; 'sujo' só as regiões que mudaram e dorme nas telas paradas")
+    parser.add_argument('--velocidade', default='1',
+                        help="Multiplicador do tempo de jogo (ex.: 1, 4, 20) ou 'instantaneo' para pular as animações")
+    parser.add_argument('--espectador', action='store_true', help="A IA também joga no lugar do jogador (IA vs IA)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed das partidas (padrão: aleatória)")
+    parser.add_argument('--replays', default='replays', help="Pasta onde gravar o replay de cada partida")
+    parser.add_argument('--sem-replays', action='store_true', help="Não grava replays")
+    parser.add_argument('--perfil', action='store_true', help="Começa com o perfil por fase e o overlay ligados (F3 alterna)")
+    parser.add_argument('--servidor', metavar='HOST[:PORTA]', help="Joga no servidor de partidas (servidor.py) em vez de localmente")
+    parser.add_argument('--jogadores', type=int, default=2, help=f"Jogadores na mesa (2 a {MAX_JOGADORES}): você contra N-1 IAs (só localmente)")
+    parser.add_argument('--cprofile', metavar='ARQUIVO', help="Roda o jogo inteiro sob cProfile e grava as estatísticas no arquivo")
+    args = parser.parse_args()
+    if not 2 <= args.jogadores <= MAX_JOGADORES:
+        parser.error(f"--jogadores precisa estar entre 2 e {MAX_JOGADORES}")
+    if args.jogadores > 2 and args.servidor:
+        parser.error("as partidas no servidor são de 2 jogadores")
+    velocidade = INSTANTANEO if args.velocidade == 'instantaneo' else float(args.velocidade)
+
+    jogo = Jogo(mostrar_tempos_quadro=args.tempos_quadro, modo_render=args.render, velocidade=velocidade, espectador=args.espectador,
+                seed=args.seed, pasta_replays=None if args.sem_replays else args.replays, perfil=args.perfil,
+                servidor=args.servidor, jogadores=args.jogadores)
+    if args.cprofile:
+        cProfile.run('jogo.run()', args.cprofile)
+    else:
+        jogo.run()
\ No newline at end of file
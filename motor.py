@@ -0,0 +1,367 @@
+import json
+import random
+from collections import deque
+from array import array
+from enum import Enum
+from operator import itemgetter
+
+# --- RESULTADOS DE RODADA ---
+JOGADOR, IA, EMPATE = 'JOGADOR', 'IA', 'EMPATE'
+
+class Difficulty(Enum):
+    FACIL = 1
+    NORMAL = 2
+    DIFICIL = 3
+
+# --- CARTAS ---
+
+class DadosBaralho:
+    """ Dados de todas as cartas num bloco compacto: uma matriz cartas x atributos
+        (array 'd', linha por carta) mais flags de super/anti-trunfo em bytearray.
+        `colunas` guarda a mesma matriz por atributo, para comparar várias cartas de uma vez. """
+    def __init__(self, cartas_data):
+        nomes_atributos = []
+        for dados in cartas_data:
+            for nome_attr in dados['atributos']:
+                if nome_attr not in nomes_atributos:
+                    nomes_atributos.append(nome_attr)
+        # Atributos só com valores inteiros voltam como int (ex.: área, força militar)
+        tipos_atributo = [
+            int if all(isinstance(d['atributos'].get(nome, 0), int) for d in cartas_data) else float
+            for nome in nomes_atributos
+        ]
+        self._montar(
+            nomes_atributos, tipos_atributo,
+            [dados['nome'] for dados in cartas_data],
+            [dados.get('bandeira_url', '') for dados in cartas_data],
+            array('d', (dados['atributos'].get(nome, 0) for dados in cartas_data for nome in nomes_atributos)),
+            bytearray(bool(d.get('super_trunfo', False)) for d in cartas_data),
+            bytearray(bool(d.get('anti_trunfo', False)) for d in cartas_data),
+        )
+
+    def _montar(self, nomes_atributos, tipos_atributo, nomes, bandeira_urls, matriz, super_trunfo, anti_trunfo):
+        self.nomes_atributos = nomes_atributos
+        self.indice_atributo = {nome: j for j, nome in enumerate(nomes_atributos)}
+        self.tipos_atributo = tipos_atributo
+        self.nomes = nomes
+        self.bandeira_urls = bandeira_urls
+        self.matriz = matriz
+        self.colunas = [matriz[j::len(nomes_atributos)] for j in range(len(nomes_atributos))]
+        self.super_trunfo = super_trunfo
+        self.anti_trunfo = anti_trunfo
+        self.cartas = [Carta(self, i) for i in range(len(nomes))]
+        self._indice = None
+        self.hash_origem = None # sha256 do JSON de origem, quando vem de compilador.carregar_dados
+
+    @classmethod
+    def de_colunas(cls, nomes_atributos, tipos_atributo, nomes, bandeira_urls, matriz, super_trunfo, anti_trunfo):
+        """ Monta a partir de colunas já prontas (ex.: baralho compilado, ver compilador.py). """
+        dados = cls.__new__(cls)
+        dados._montar(nomes_atributos, tipos_atributo, nomes, bandeira_urls, matriz, super_trunfo, anti_trunfo)
+        return dados
+
+    @classmethod
+    def de_json(cls, arquivo_json):
+        with open(arquivo_json, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def indice(self):
+        """ indice.IndiceBaralho: o gravado ao lado do baralho (ver indice.carregar_baralho) ou, se
+            os dados vieram de outro lugar, construído na primeira vez que é usado. """
+        if self._indice is None:
+            from indice import IndiceBaralho # indice.py importa motor
+            self._indice = IndiceBaralho.construir(self)
+        return self._indice
+
+    @indice.setter
+    def indice(self, indice):
+        self._indice = indice
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def linha(self, indice):
+        n = len(self.nomes_atributos)
+        return self.matriz[indice * n:(indice + 1) * n]
+
+    def valor(self, indice, nome_attr):
+        j = self.indice_atributo.get(nome_attr)
+        if j is None:
+            return 0
+        return self.matriz[indice * len(self.nomes_atributos) + j]
+
+class Carta:
+    """ Visão leve sobre uma linha de DadosBaralho; não copia nenhum dado da carta. """
+    __slots__ = ('dados', 'indice')
+
+    def __init__(self, dados, indice):
+        self.dados = dados
+        self.indice = indice
+
+    @property
+    def nome(self):
+        return self.dados.nomes[self.indice]
+
+    @property
+    def atributos(self):
+        dados = self.dados
+        return {nome: tipo(valor) for nome, tipo, valor in zip(dados.nomes_atributos, dados.tipos_atributo, dados.linha(self.indice))}
+
+    @property
+    def super_trunfo(self):
+        return bool(self.dados.super_trunfo[self.indice])
+
+    @property
+    def anti_trunfo(self):
+        return bool(self.dados.anti_trunfo[self.indice])
+
+    def obter_valor_atributo(self, nome_attr):
+        dados = self.dados
+        j = dados.indice_atributo.get(nome_attr)
+        if j is None:
+            return 0
+        return dados.tipos_atributo[j](dados.valor(self.indice, nome_attr))
+
+    def __repr__(self):
+        return f"Carta({self.nome!r})"
+
+def carregar_cartas(arquivo_json):
+    return DadosBaralho.de_json(arquivo_json).cartas
+
+# --- REGRAS ---
+
+def resolver_confronto(carta_j, carta_i, atributo):
+    """ Decide o vencedor de uma rodada entre a carta do jogador e a da IA.
+        Lê direto da matriz de DadosBaralho, sem montar o dict de atributos. """
+    dados = carta_j.dados
+    j, i = carta_j.indice, carta_i.indice
+    super_j, super_i = dados.super_trunfo[j], dados.super_trunfo[i]
+    if super_j or super_i:
+        anti_j, anti_i = dados.anti_trunfo[j], dados.anti_trunfo[i]
+        if super_j and not anti_i: return JOGADOR
+        if super_i and not anti_j: return IA
+        if super_j and anti_i: return IA # Anti-trunfo vence
+        if super_i and anti_j: return JOGADOR # Anti-trunfo vence
+
+    valor_j = dados.valor(j, atributo)
+    valor_i = dados.valor(i, atributo)
+    if valor_j > valor_i: return JOGADOR
+    if valor_i > valor_j: return IA
+    return EMPATE
+
+def recolher_cartas(vencedor, mao_jogador, mao_ia, pilha_empate):
+    """ Tira a carta do topo de cada mão e entrega a rodada (e a pilha de empate) ao vencedor.
+        Mãos e pilha são deques: tirar do topo e devolver ao fundo custam O(1).
+        Retorna o novo valor de turno_do_jogador, ou None se o turno não muda (empate). """
+    carta_j, carta_i = mao_jogador.popleft(), mao_ia.popleft()
+
+    if vencedor == EMPATE:
+        pilha_empate.appendleft(carta_i)
+        pilha_empate.appendleft(carta_j)
+        return None
+
+    mao_vencedor = mao_jogador if vencedor == JOGADOR else mao_ia
+    mao_vencedor.append(carta_j)
+    mao_vencedor.append(carta_i)
+    mao_vencedor.extend(pilha_empate)
+    pilha_empate.clear()
+    return vencedor == JOGADOR
+
+def escolher_atributo(carta, dificuldade, rng=random):
+    """ IA com níveis de dificuldade. """
+    nomes_atributos = carta.dados.nomes_atributos
+    if dificuldade == Difficulty.FACIL:
+        return rng.choice(nomes_atributos)
+
+    # Dificuldade Normal: o atributo que vence mais cartas do baralho, já calculado no índice (O(1))
+    return nomes_atributos[carta.dados.indice.melhor[carta.indice]]
+
+def vencedor_partida(mao_jogador, mao_ia):
+    """ JOGADOR ou IA se só um lado ainda tem cartas. None com a partida em andamento, interrompida
+        por max_rodadas, ou se um empate esvaziou as duas mãos. """
+    if not mao_ia and mao_jogador: return JOGADOR
+    if not mao_jogador and mao_ia: return IA
+    return None
+
+def distribuir(cartas, rng=random):
+    """ Embaralha e divide as cartas em duas mãos (deques). """
+    cartas_embaralhadas = list(cartas)
+    rng.shuffle(cartas_embaralhadas)
+    metade = len(cartas_embaralhadas) // 2
+    return deque(cartas_embaralhadas[:metade]), deque(cartas_embaralhadas[metade:])
+
+# --- PARTIDA HEADLESS ---
+
+class Partida:
+    """ Uma partida completa sem pygame nem temporizadores: cada chamada a jogar_rodada
+        executa resolver + finalizar de uma vez. """
+    def __init__(self, cartas, rng=None, max_rodadas=10000):
+        self.rng = rng or random.Random()
+        self.max_rodadas = max_rodadas
+
+        self.mao_jogador, self.mao_ia = distribuir(cartas, self.rng)
+        self.pilha_empate = deque()
+        self.turno_do_jogador = self.rng.choice([True, False])
+        self.rodadas = 0
+        self.ao_rodada = None # Chamado com (atributo, vencedor) a cada rodada (ex.: replay.GravadorReplay.rodada)
+
+    @classmethod
+    def de_maos(cls, mao_jogador, mao_ia, pilha_empate=(), turno_do_jogador=True, rng=None, max_rodadas=10000):
+        """ Monta uma partida a partir de mãos já definidas (ex.: para simular a partir de um estado). """
+        partida = cls.__new__(cls)
+        partida.rng = rng or random.Random()
+        partida.max_rodadas = max_rodadas
+        partida.mao_jogador, partida.mao_ia = deque(mao_jogador), deque(mao_ia)
+        partida.pilha_empate = deque(pilha_empate)
+        partida.turno_do_jogador = turno_do_jogador
+        partida.rodadas = 0
+        partida.ao_rodada = None
+        return partida
+
+    @property
+    def terminou(self):
+        return not self.mao_jogador or not self.mao_ia or self.rodadas >= self.max_rodadas
+
+    @property
+    def vencedor(self):
+        return vencedor_partida(self.mao_jogador, self.mao_ia)
+
+    def jogar_rodada(self, atributo):
+        vencedor = resolver_confronto(self.mao_jogador[0], self.mao_ia[0], atributo)
+        turno = recolher_cartas(vencedor, self.mao_jogador, self.mao_ia, self.pilha_empate)
+        if turno is not None:
+            self.turno_do_jogador = turno
+        self.rodadas += 1
+        if self.ao_rodada is not None:
+            self.ao_rodada(atributo, vencedor)
+        return vencedor
+
+    def jogar(self, escolha_jogador, escolha_ia):
+        """ Joga até o fim. Cada escolha é uma função (carta, rng) -> atributo. """
+        while not self.terminou:
+            if self.turno_do_jogador:
+                atributo = escolha_jogador(self.mao_jogador[0], self.rng)
+            else:
+                atributo = escolha_ia(self.mao_ia[0], self.rng)
+            self.jogar_rodada(atributo)
+        return self.vencedor
+
+# --- N JOGADORES ---
+
+def distribuir_n(cartas, n_jogadores, rng=random):
+    """ Embaralha e divide as cartas em n mãos (deques). Quando a divisão não é exata, as últimas
+        mãos ficam com uma carta a mais; com 2 jogadores é o mesmo que distribuir(). """
+    cartas_embaralhadas = list(cartas)
+    rng.shuffle(cartas_embaralhadas)
+    base, sobra = divmod(len(cartas_embaralhadas), n_jogadores)
+    maos, inicio = [], 0
+    for j in range(n_jogadores):
+        fim = inicio + base + (j >= n_jogadores - sobra)
+        maos.append(deque(cartas_embaralhadas[inicio:fim]))
+        inicio = fim
+    return maos
+
+def resolver_confronto_n(cartas, atributo):
+    """ Decide a rodada entre as cartas da mesa (uma por jogador, pelo menos duas). Retorna a
+        posição da vencedora em `cartas`, ou None em caso de empate.
+
+        O super-trunfo vence todas as outras, a não ser que haja anti-trunfo na mesa: aí vence o
+        anti-trunfo (havendo mais de um, o atributo decide entre eles). Sem super-trunfo, vence o
+        maior valor; se mais de uma carta tem o maior valor, a rodada empata. Com duas cartas dá o
+        mesmo resultado que resolver_confronto. """
+    dados = cartas[0].dados
+    indices = [carta.indice for carta in cartas]
+    pegar = itemgetter(*indices) # Lê a mesma posição de todas as cartas numa só chamada
+    posicoes = range(len(indices))
+    if 1 in pegar(dados.super_trunfo):
+        anti = [p for p, flag in enumerate(pegar(dados.anti_trunfo)) if flag]
+        if not anti:
+            return pegar(dados.super_trunfo).index(1)
+        if len(anti) == 1:
+            return anti[0]
+        posicoes = anti
+        pegar = itemgetter(*(indices[p] for p in anti))
+
+    valores = pegar(dados.colunas[dados.indice_atributo[atributo]])
+    maior = max(valores)
+    if valores.count(maior) > 1:
+        return None
+    return posicoes[valores.index(maior)]
+
+class PartidaN:
+    """ Partida headless com N jogadores (assentos 0..n-1). Quem vence a rodada leva as cartas da
+        mesa e a pilha de empate, e escolhe o próximo atributo. No empate, as cartas da mesa vão para
+        a pilha e quem escolheu escolhe de novo. Quem fica sem cartas sai da mesa; se era a vez dele
+        (num empate), ela passa para o próximo assento ainda ativo.
+
+        Com 2 jogadores, a mesma seed dá exatamente a mesma partida de Partida (assento 0 = jogador). """
+    def __init__(self, cartas, n_jogadores, rng=None, max_rodadas=10000):
+        self.rng = rng or random.Random()
+        self.max_rodadas = max_rodadas
+
+        self.maos = distribuir_n(cartas, n_jogadores, self.rng)
+        self.pilha_empate = deque()
+        self.ativos = [j for j, mao in enumerate(self.maos) if mao] # Assentos com cartas, em ordem
+        self.vez = self.rng.choice(self.ativos)
+        self.rodadas = 0
+        self.ao_rodada = None # Chamado com (atributo, vencedor) a cada rodada
+
+    @classmethod
+    def de_maos(cls, maos, pilha_empate=(), vez=0, rng=None, max_rodadas=10000):
+        """ Monta uma partida a partir de mãos já definidas (ex.: para simular a partir de um estado). """
+        partida = cls.__new__(cls)
+        partida.rng = rng or random.Random()
+        partida.max_rodadas = max_rodadas
+        partida.maos = [deque(mao) for mao in maos]
+        partida.pilha_empate = deque(pilha_empate)
+        partida.ativos = [j for j, mao in enumerate(partida.maos) if mao]
+        partida.vez = vez
+        partida.rodadas = 0
+        partida.ao_rodada = None
+        return partida
+
+    @property
+    def n_jogadores(self):
+        return len(self.maos)
+
+    @property
+    def terminou(self):
+        return len(self.ativos) <= 1 or self.rodadas >= self.max_rodadas
+
+    @property
+    def vencedor(self):
+        """ Assento do vencedor; None com a partida em andamento, interrompida por max_rodadas ou
+            se todos ficaram sem cartas no mesmo empate. """
+        return self.ativos[0] if len(self.ativos) == 1 else None
+
+    def jogar_rodada(self, atributo):
+        """ Retorna o assento que venceu a rodada, ou EMPATE. """
+        ativos, maos = self.ativos, self.maos
+        mesa = [maos[j].popleft() for j in ativos]
+        posicao = resolver_confronto_n(mesa, atributo)
+        if posicao is None:
+            self.pilha_empate.extendleft(reversed(mesa)) # Mesma ordem de recolher_cartas
+            vencedor = EMPATE
+        else:
+            vencedor = self.vez = ativos[posicao]
+            mao_vencedor = maos[vencedor]
+            mao_vencedor.extend(mesa)
+            mao_vencedor.extend(self.pilha_empate)
+            self.pilha_empate.clear()
+
+        if not all(map(maos.__getitem__, ativos)): # Só quem jogou nesta rodada pode ter ficado sem cartas
+            self.ativos = [j for j in ativos if maos[j]]
+            if self.ativos and not maos[self.vez]:
+                self.vez = next((j for j in self.ativos if j > self.vez), self.ativos[0])
+
+        self.rodadas += 1
+        if self.ao_rodada is not None:
+            self.ao_rodada(atributo, vencedor)
+        return vencedor
+
+    def jogar(self, escolhas):
+        """ Joga até o fim. `escolhas` tem uma função (carta, rng) -> atributo por assento. """
+        while not self.terminou:
+            self.jogar_rodada(escolhas[self.vez](self.maos[self.vez][0], self.rng))
+        return self.vencedor
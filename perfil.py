@@ -0,0 +1,224 @@
+""" Instrumentação do loop principal: tempo por fase, superfícies criadas e overlay na tela.
+
+Ligado, o Perfilador troca métodos do objeto instrumentado por versões cronometradas (atributos
+da instância, que têm precedência sobre os da classe) e conta as superfícies criadas por
+pygame.Surface e pygame.transform. Desligado, tudo isso é removido: os métodos originais voltam
+a ser chamados direto e o loop só paga um `if perfil.ativo` por quadro.
+
+Cada quadro vira uma amostra nos ring buffers (deque com maxlen): duração do quadro, superfícies
+criadas e o tempo acumulado de cada fase no quadro. Os tempos das fases são inclusivos
+(renderizar_tela inclui desenhar_carta, por exemplo).
+"""
+import cProfile
+import csv
+import json
+import os
+import time
+from collections import defaultdict, deque
+
+import pygame
+
+PASTA_PERFIL = "perfil"
+INTERVALO_OVERLAY = 0.25 # Segundos entre atualizações do texto do overlay
+FASES_NO_OVERLAY = 10
+
+# Funções de pygame.transform contadas -> posição do argumento dest_surface (None: sempre alocam)
+_FUNCOES_TRANSFORM = {'scale': 2, 'smoothscale': 2, 'scale_by': 2, 'smoothscale_by': 2, 'rotate': None, 'rotozoom': None, 'flip': None}
+_superficies_criadas = 0
+
+class _SuperficieContada(pygame.Surface):
+    """ Substitui pygame.Surface enquanto o perfil está ligado, contando cada criação. """
+    def __init__(self, *args, **kwargs):
+        global _superficies_criadas
+        super().__init__(*args, **kwargs)
+        _superficies_criadas += 1
+
+def _contar_transform(funcao, posicao_destino):
+    def contada(*args, **kwargs):
+        global _superficies_criadas
+        if posicao_destino is None or (len(args) <= posicao_destino and kwargs.get('dest_surface') is None): # Com destino, nada é alocado
+            _superficies_criadas += 1
+        return funcao(*args, **kwargs)
+    return contada
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    return valores_ordenados[min(len(valores_ordenados) - 1, int(p / 100 * len(valores_ordenados)))]
+
+class Perfilador:
+    def __init__(self, capacidade=600):
+        self.capacidade = capacidade
+        self.ativo = False
+        self.fases = [] # Nomes dos métodos instrumentados
+        self.tempos_quadro = deque(maxlen=capacidade) # ms
+        self.inicios_quadro = deque(maxlen=capacidade) # perf_counter, para o FPS
+        self.superficies = deque(maxlen=capacidade) # Superfícies criadas por quadro
+        self.tempos_fase = {} # fase -> deque de ms por quadro
+        self.contadores_extra = [] # Funções que retornam contagens acumuladas de alocações
+        self._acumulado = defaultdict(float)
+        self._alvos = []
+        self._originais = {}
+        self._base_extra = 0
+        self._base_superficies = 0
+        self._overlay = None
+        self._overlay_atualizado = 0.0
+        self._cprofile = None
+
+    # --- Ligar/desligar ---
+
+    def instrumentar(self, objeto, nomes):
+        """ Registra métodos de `objeto` a cronometrar quando o perfil estiver ligado. """
+        self._alvos.append((objeto, list(nomes)))
+        self.fases.extend(nome for nome in nomes if nome not in self.fases)
+
+    def adicionar_contador(self, funcao):
+        """ funcao() -> total acumulado de superfícies criadas por um caminho que o perfil não vê
+            (ex.: faltas do cache de texto, que chamam Font.render). """
+        self.contadores_extra.append(funcao)
+
+    def ligar(self):
+        if self.ativo:
+            return
+        self.ativo = True
+        for objeto, nomes in self._alvos:
+            for nome in nomes:
+                setattr(objeto, nome, self._cronometrar(nome, getattr(objeto, nome)))
+        self._originais = {'Surface': pygame.Surface}
+        pygame.Surface = _SuperficieContada
+        for nome, posicao_destino in _FUNCOES_TRANSFORM.items():
+            if hasattr(pygame.transform, nome):
+                self._originais[nome] = getattr(pygame.transform, nome)
+                setattr(pygame.transform, nome, _contar_transform(self._originais[nome], posicao_destino))
+        self.tempos_fase = {fase: deque(maxlen=self.capacidade) for fase in self.fases}
+        for buffer in (self.tempos_quadro, self.inicios_quadro, self.superficies):
+            buffer.clear()
+        self._base_superficies, self._base_extra = _superficies_criadas, self._total_extra()
+        self._acumulado.clear()
+
+    def desligar(self):
+        if not self.ativo:
+            return
+        self.ativo = False
+        for objeto, nomes in self._alvos:
+            for nome in nomes:
+                vars(objeto).pop(nome, None) # Volta a valer o método da classe
+        pygame.Surface = self._originais.pop('Surface')
+        for nome, funcao in self._originais.items():
+            setattr(pygame.transform, nome, funcao)
+        self._originais = {}
+        self._overlay = None
+
+    def alternar(self):
+        self.desligar() if self.ativo else self.ligar()
+
+    def _cronometrar(self, nome, metodo):
+        acumulado, relogio = self._acumulado, time.perf_counter
+        def cronometrado(*args, **kwargs):
+            inicio = relogio()
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                acumulado[nome] += relogio() - inicio
+        return cronometrado
+
+    def _total_extra(self):
+        return sum(funcao() for funcao in self.contadores_extra)
+
+    # --- Amostras ---
+
+    def fim_quadro(self, inicio, duracao):
+        """ Fecha a amostra do quadro que começou em `inicio` e durou `duracao` segundos. """
+        self.inicios_quadro.append(inicio)
+        self.tempos_quadro.append(duracao * 1000)
+        extra = self._total_extra()
+        self.superficies.append(_superficies_criadas - self._base_superficies + extra - self._base_extra)
+        self._base_superficies, self._base_extra = _superficies_criadas, extra
+        for fase, tempos in self.tempos_fase.items():
+            tempos.append(self._acumulado.get(fase, 0.0) * 1000)
+        self._acumulado.clear()
+
+    def resumo(self):
+        tempos = sorted(self.tempos_quadro)
+        duracao = self.inicios_quadro[-1] - self.inicios_quadro[0] if len(self.inicios_quadro) > 1 else 0
+        return {
+            'quadros': len(tempos),
+            'fps': (len(self.inicios_quadro) - 1) / duracao if duracao > 0 else 0.0,
+            'quadro_ms': {
+                'media': sum(tempos) / len(tempos) if tempos else 0.0,
+                'p50': percentil(tempos, 50),
+                'p99': percentil(tempos, 99),
+                'max': tempos[-1] if tempos else 0.0,
+            },
+            'superficies_por_quadro': sum(self.superficies) / len(self.superficies) if self.superficies else 0.0,
+            'fases_ms': {fase: sum(t) / len(t) for fase, t in self.tempos_fase.items() if t},
+        }
+
+    # --- Overlay ---
+
+    def desenhar_overlay(self, tela, fonte, pos=(8, 8)):
+        """ Desenha o overlay e retorna o Rect ocupado. O texto só é refeito a cada INTERVALO_OVERLAY. """
+        agora = time.perf_counter()
+        if self._overlay is None or agora - self._overlay_atualizado >= INTERVALO_OVERLAY:
+            self._overlay = self._montar_overlay(fonte)
+            self._overlay_atualizado = agora
+        tela.blit(self._overlay, pos)
+        return self._overlay.get_rect(topleft=pos)
+
+    def _montar_overlay(self, fonte):
+        r = self.resumo()
+        linhas = [
+            (f"FPS {r['fps']:.1f}   quadro p50 {r['quadro_ms']['p50']:.2f} ms   p99 {r['quadro_ms']['p99']:.2f} ms", ""),
+            ("superfícies/quadro", f"{r['superficies_por_quadro']:.1f}"),
+        ]
+        fases = sorted(r['fases_ms'].items(), key=lambda item: -item[1])[:FASES_NO_OVERLAY]
+        linhas.extend((fase, f"{ms:.2f} ms") for fase, ms in fases)
+
+        branco = (255, 255, 255)
+        textos = [(fonte.render(rotulo, True, branco), fonte.render(valor, True, branco)) for rotulo, valor in linhas]
+        largura_rotulo = max(rotulo.get_width() for rotulo, valor in textos[1:])
+        largura_valor = max(valor.get_width() for _, valor in textos)
+        largura = max(textos[0][0].get_width(), largura_rotulo + 16 + largura_valor) + 16
+        altura_linha = fonte.get_linesize()
+        fundo = self._originais.get('Surface', pygame.Surface)( # Fora da contagem de alocações
+            (largura, altura_linha * len(textos) + 12), pygame.SRCALPHA)
+        fundo.fill((0, 0, 0, 180))
+        for i, (rotulo, valor) in enumerate(textos):
+            y = 6 + i * altura_linha
+            fundo.blit(rotulo, (8, y))
+            fundo.blit(valor, (largura - 8 - valor.get_width(), y))
+        return fundo
+
+    # --- Exportação ---
+
+    def exportar(self, pasta=PASTA_PERFIL):
+        """ Grava o resumo e as amostras em JSON e uma linha por quadro em CSV; retorna os caminhos. """
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, time.strftime('perfil-%Y%m%d-%H%M%S'))
+        fases = list(self.tempos_fase)
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'resumo': self.resumo(),
+                'quadro_ms': list(self.tempos_quadro),
+                'superficies': list(self.superficies),
+                'fases_ms': {fase: list(self.tempos_fase[fase]) for fase in fases},
+            }, f, ensure_ascii=False, indent=1)
+        with open(base + '.csv', 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(['quadro_ms', 'superficies'] + fases)
+            colunas = [self.tempos_quadro, self.superficies] + [self.tempos_fase[fase] for fase in fases]
+            escritor.writerows(zip(*colunas))
+        return base + '.json', base + '.csv'
+
+    def alternar_cprofile(self, pasta=PASTA_PERFIL):
+        """ Liga o cProfile, ou desliga e grava as estatísticas (.prof, para pstats/snakeviz); retorna o caminho gravado. """
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+            return None
+        self._cprofile.disable()
+        os.makedirs(pasta, exist_ok=True)
+        caminho = os.path.join(pasta, time.strftime('cprofile-%Y%m%d-%H%M%S.prof'))
+        self._cprofile.dump_stats(caminho)
+        self._cprofile = None
+        return caminho
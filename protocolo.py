@@ -0,0 +1,45 @@
+""" Protocolo entre o servidor de partidas (servidor.py) e o cliente pygame (jogo.py --servidor).
+
+TCP, uma mensagem JSON por linha (UTF-8, terminada em '\\n'), sempre um objeto com "tipo".
+As cartas viajam como índices no baralho: cliente e servidor precisam do mesmo baralho, o que
+o cliente confere com a assinatura recebida em "bem_vindo" (replay.assinatura_baralho).
+
+Cliente -> servidor:
+    {"tipo": "entrar", "oponente": "ia", "dificuldade": "NORMAL"}   partida contra a IA do servidor
+    {"tipo": "entrar", "oponente": "humano"}                        fila para jogar contra outra pessoa
+    {"tipo": "escolher", "atributo": "area"}                        só na sua vez
+    {"tipo": "sair"}                                                abandona a partida atual
+
+Servidor -> cliente:
+    {"tipo": "bem_vindo", "assinatura": "...", "atributos": [...]}
+    {"tipo": "aguardando"}                                          na fila por um oponente humano
+    {"tipo": "partida", "oponente": "ia" | "humano", "estado": ESTADO}
+    {"tipo": "rodada", "atributo": "...", "cartas": [sua, do oponente], "vencedor": RESULTADO, "estado": ESTADO}
+    {"tipo": "fim", "vencedor": RESULTADO, "motivo": "cartas" | "abandono" | "limite"}
+    {"tipo": "erro", "mensagem": "..."}
+
+    ESTADO = {"mao": [índices], "oponente": n cartas, "empate": [índices], "sua_vez": bool}
+    RESULTADO = "voce", "oponente" ou "empate"
+
+A mão do oponente nunca é enviada; a carta dele só aparece em "rodada", depois da escolha.
+"""
+import json
+
+PORTA_PADRAO = 7777
+LIMITE_LINHA = 4096 # Bytes; uma mensagem maior derruba a conexão
+VOCE, OPONENTE, EMPATE = 'voce', 'oponente', 'empate'
+
+def codificar(mensagem):
+    return json.dumps(mensagem, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+def decodificar(linha):
+    """ dict da mensagem; ValueError se a linha não for um objeto JSON com "tipo". """
+    mensagem = json.loads(linha)
+    if not isinstance(mensagem, dict) or not isinstance(mensagem.get('tipo'), str):
+        raise ValueError("mensagem sem 'tipo'")
+    return mensagem
+
+def endereco(texto, porta_padrao=PORTA_PADRAO):
+    """ 'host:porta' (ou só 'host') -> (host, porta). """
+    host, _, porta = texto.rpartition(':') if ':' in texto else (texto, '', '')
+    return host or 'localhost', int(porta) if porta else porta_padrao
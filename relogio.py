@@ -0,0 +1,45 @@
+""" Relógio de jogo com passo fixo, independente da taxa de quadros. """
+import time
+
+INSTANTANEO = float('inf')
+
+class RelogioJogo:
+    """ Acumula o tempo real decorrido (multiplicado por `escala`) e o entrega à lógica em
+        passos fixos de `passo` segundos. Se a renderização atrasa, vários passos rodam antes do
+        próximo quadro (frame-skip), até `max_passos_por_quadro`; o atraso além disso é descartado.
+
+        escala 1.0 = tempo normal, N = N vezes mais rápido, INSTANTANEO = todas as durações
+        de animação são puladas (a lógica roda o máximo de passos por quadro). """
+    def __init__(self, passo=1/120, escala=1.0, max_passos_por_quadro=240, fonte_tempo=time.monotonic):
+        self.passo = passo
+        self.escala = escala
+        self.max_passos_por_quadro = max_passos_por_quadro
+        self.fonte_tempo = fonte_tempo
+        self.tempo = 0.0 # Tempo de jogo, em segundos
+        self._acumulado = 0.0
+        self._ultimo = fonte_tempo()
+
+    @property
+    def instantaneo(self):
+        return self.escala == INSTANTANEO
+
+    def descartar_atraso(self):
+        """ Esquece o tempo real passado desde o último quadro (ex.: depois de dormir esperando evento). """
+        self._ultimo = self.fonte_tempo()
+        self._acumulado = 0.0
+
+    def passos(self):
+        """ Gera um item por passo de lógica a executar neste quadro, avançando `tempo` a cada um. """
+        agora = self.fonte_tempo()
+        decorrido, self._ultimo = agora - self._ultimo, agora
+
+        if self.instantaneo:
+            n = self.max_passos_por_quadro
+        else:
+            self._acumulado += decorrido * self.escala
+            n = min(int(self._acumulado / self.passo), self.max_passos_por_quadro)
+            self._acumulado = min(self._acumulado - n * self.passo, self.passo)
+
+        for _ in range(n):
+            self.tempo += self.passo
+            yield
@@ -0,0 +1,175 @@
+""" Replays de partidas: gravação incremental e verificação headless em paralelo.
+
+Uma partida é reproduzível a partir da seed (que embaralha, distribui e sorteia quem começa,
+como em motor.Partida) e do atributo escolhido em cada rodada. O arquivo .replay é texto
+ASCII, escrito só por acréscimo enquanto a partida acontece:
+
+    ST1 <seed> <assinatura do baralho>
+    <índice do atributo><resultado>      uma linha por rodada; resultado J, I ou E
+    = <vencedor> <rodadas>               só quando a partida termina; vencedor J, I ou -
+
+Um replay sem a linha final (jogo fechado no meio) ainda é verificado até onde foi.
+A verificação refaz cada partida com motor.Partida e aponta qualquer rodada em que o
+resultado gravado não bate com as regras atuais.
+
+Uso:
+    python replay.py replays/ [--baralho baralho.json] [--processos N]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import indice
+import motor
+
+ASSINATURA_FORMATO = 'ST1'
+EXTENSAO = '.replay'
+CODIGOS = {motor.JOGADOR: 'J', motor.IA: 'I', motor.EMPATE: 'E', None: '-'}
+
+def assinatura_baralho(dados):
+    """ Identifica o conteúdo das regras (atributos, cartas, valores, trunfos), não o arquivo. """
+    h = hashlib.sha256()
+    h.update('\0'.join(dados.nomes_atributos + dados.nomes).encode('utf-8'))
+    h.update(dados.matriz.tobytes())
+    h.update(bytes(dados.super_trunfo) + bytes(dados.anti_trunfo))
+    return h.hexdigest()[:16]
+
+class GravadorReplay:
+    """ Escreve o replay de uma partida conforme ela acontece. Com descarregar=True cada rodada
+        vai para o disco na hora (o arquivo fica válido mesmo se o jogo for fechado). """
+    def __init__(self, caminho, seed, dados, descarregar=True):
+        self.caminho = caminho
+        self.indice_atributo = dados.indice_atributo
+        self.rodadas = 0
+        self._arquivo = open(caminho, 'w', encoding='ascii', buffering=1 if descarregar else -1)
+        self._arquivo.write(f"{ASSINATURA_FORMATO} {seed} {assinatura_baralho(dados)}\n")
+
+    @classmethod
+    def em_pasta(cls, pasta, seed, dados, descarregar=True):
+        """ Grava em <pasta>/<data-hora>-<seed>.replay, sem sobrescrever replays existentes. """
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed}")
+        caminho, n = base + EXTENSAO, 1
+        while os.path.exists(caminho):
+            n += 1
+            caminho = f"{base}-{n}{EXTENSAO}"
+        return cls(caminho, seed, dados, descarregar)
+
+    def rodada(self, atributo, vencedor):
+        self._arquivo.write(f"{self.indice_atributo[atributo]}{CODIGOS[vencedor]}\n")
+        self.rodadas += 1
+
+    def fim(self, vencedor):
+        self._arquivo.write(f"= {CODIGOS[vencedor]} {self.rodadas}\n")
+        self.fechar()
+
+    def fechar(self):
+        self._arquivo.close()
+
+def ler(caminho):
+    """ Retorna (seed, assinatura, [(índice do atributo, código)], (código do vencedor, rodadas) ou None). """
+    with open(caminho, 'r', encoding='ascii') as f:
+        cabecalho = f.readline().split()
+        if len(cabecalho) != 3 or cabecalho[0] != ASSINATURA_FORMATO:
+            raise ValueError("cabeçalho inválido")
+        rodadas, final = [], None
+        for numero, linha in enumerate(f, start=2):
+            linha = linha.rstrip('\n')
+            if final is not None:
+                raise ValueError(f"linha {numero}: conteúdo depois do fim da partida")
+            if linha.startswith('='):
+                _, vencedor, total = linha.split()
+                final = (vencedor, int(total))
+            elif len(linha) >= 2 and linha[:-1].isdigit():
+                rodadas.append((int(linha[:-1]), linha[-1]))
+            else:
+                raise ValueError(f"linha {numero}: rodada inválida {linha!r}")
+    return int(cabecalho[1]), cabecalho[2], rodadas, final
+
+def verificar(caminho, dados, assinatura=None):
+    """ Refaz a partida do replay. Retorna (status, mensagem): status 'ok', 'incompleto'
+        (sem a linha final, mas sem divergências), 'divergente' ou 'invalido'. """
+    try:
+        seed, assinatura_replay, rodadas, final = ler(caminho)
+    except (OSError, ValueError) as erro:
+        return 'invalido', str(erro)
+    if assinatura_replay != (assinatura or assinatura_baralho(dados)):
+        return 'invalido', f"gravado com outro baralho ({assinatura_replay})"
+
+    partida = motor.Partida(dados.cartas, random.Random(seed), max_rodadas=float('inf'))
+    for numero, (j, codigo) in enumerate(rodadas, start=1):
+        if partida.terminou:
+            return 'divergente', f"rodada {numero}: a partida já tinha terminado"
+        if j >= len(dados.nomes_atributos):
+            return 'invalido', f"rodada {numero}: atributo {j} não existe"
+        cartas = (partida.mao_jogador[0].nome, partida.mao_ia[0].nome)
+        vencedor = partida.jogar_rodada(dados.nomes_atributos[j])
+        if CODIGOS[vencedor] != codigo:
+            return 'divergente', (f"rodada {numero}: {cartas[0]} x {cartas[1]} em '{dados.nomes_atributos[j]}' "
+                                  f"gravou {codigo}, as regras dão {CODIGOS[vencedor]}")
+
+    if final is None:
+        return 'incompleto', f"{len(rodadas)} rodadas, sem fim de partida"
+    if final != (CODIGOS[partida.vencedor], partida.rodadas):
+        return 'divergente', f"fim gravado {final}, as regras dão {(CODIGOS[partida.vencedor], partida.rodadas)}"
+    return 'ok', ''
+
+# --- Verificação em paralelo ---
+
+_dados = None # Carregados uma vez por processo (ver _iniciar_worker)
+_assinatura = None
+
+def _iniciar_worker(arquivo_json):
+    global _dados, _assinatura
+    _dados = indice.carregar_baralho(arquivo_json)
+    _assinatura = assinatura_baralho(_dados)
+
+def _verificar_arquivo(caminho):
+    return (caminho,) + verificar(caminho, _dados, _assinatura)
+
+def listar_replays(caminhos):
+    arquivos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            arquivos.extend(sorted(glob.glob(os.path.join(caminho, '**', '*' + EXTENSAO), recursive=True)))
+        else:
+            arquivos.append(caminho)
+    return arquivos
+
+def verificar_em_paralelo(arquivos, arquivo_json='baralho.json', processos=None):
+    """ Retorna [(caminho, status, mensagem)] na ordem dos arquivos. """
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(arquivos) < 2:
+        _iniciar_worker(arquivo_json)
+        return list(map(_verificar_arquivo, arquivos))
+    with Pool(processos, initializer=_iniciar_worker, initargs=(arquivo_json,)) as pool:
+        return pool.map(_verificar_arquivo, arquivos, chunksize=max(1, len(arquivos) // (processos * 8)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica replays contra as regras atuais do jogo.")
+    parser.add_argument('caminhos', nargs='+', help="Arquivos .replay ou pastas com eles")
+    parser.add_argument('--baralho', default='baralho.json')
+    parser.add_argument('--processos', type=int, default=None, help="Padrão: número de núcleos")
+    args = parser.parse_args()
+
+    arquivos = listar_replays(args.caminhos)
+    inicio = time.perf_counter()
+    resultados = verificar_em_paralelo(arquivos, args.baralho, args.processos)
+    duracao = time.perf_counter() - inicio
+
+    contagem = {status: 0 for status in ('ok', 'incompleto', 'divergente', 'invalido')}
+    for caminho, status, mensagem in resultados:
+        contagem[status] += 1
+        if status in ('divergente', 'invalido'):
+            print(f"{status.upper()}: {caminho}: {mensagem}")
+    print(f"{len(arquivos)} replays em {duracao:.2f}s ({len(arquivos) / max(duracao, 1e-9):.0f}/s): "
+          + ", ".join(f"{n} {status}" for status, n in contagem.items()))
+    if contagem['divergente'] or contagem['invalido']:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
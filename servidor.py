@@ -0,0 +1,288 @@
+""" Servidor de partidas: muitas partidas simultâneas (humano x humano e humano x IA) num só processo.
+
+Um único event loop asyncio atende todas as conexões (protocolo em protocolo.py). Cada partida é
+um motor.Partida, com as mesmas regras de Jogo.resolver_rodada/finalizar_rodada; as mãos guardam
+só referências às cartas do baralho, compartilhado por todas as partidas. Uma sessão ociosa custa
+a conexão e uma corrotina parada em readline(), então milhares delas cabem num processo.
+
+As IAs fácil e normal decidem na hora, dentro do loop. A difícil roda num PensadorIA (processos à
+parte) e o loop só espera o Future, sem travar as outras partidas.
+
+Uso:
+    python servidor.py [--host 0.0.0.0] [--porta 7777] [--processos-ia N] [--status 10]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import ia
+import indice
+import motor
+import protocolo
+import replay
+from motor import Difficulty
+
+def aumentar_limite_arquivos():
+    """ Sobe o limite de arquivos abertos até o máximo permitido (cada conexão é um descritor). """
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    suave, rigido = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if rigido != resource.RLIM_INFINITY and suave < rigido:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (rigido, rigido))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+class Sessao:
+    """ Uma conexão de cliente; `partida` e `lado` apontam para a partida em que ele está. """
+    __slots__ = ('writer', 'partida', 'lado')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.partida = None
+        self.lado = 0
+
+    def enviar(self, **mensagem):
+        self.writer.write(protocolo.codificar(mensagem))
+
+class PartidaRede:
+    """ Uma partida do servidor. O lado 0 joga com mao_jogador do motor.Partida e o lado 1 com
+        mao_ia; cada assento é uma Sessao ou None (a IA do servidor, na `dificuldade`). """
+    __slots__ = ('partida', 'sessoes', 'dificuldade', 'ativa', 'cartas_iniciais')
+
+    def __init__(self, cartas, sessoes, dificuldade, seed, max_rodadas):
+        self.partida = motor.Partida(cartas, random.Random(seed), max_rodadas)
+        self.cartas_iniciais = (len(self.partida.mao_jogador), len(self.partida.mao_ia)) # Por lado, para ia.cartas_ocultas
+        self.sessoes = sessoes
+        self.dificuldade = dificuldade
+        self.ativa = True
+
+    @property
+    def lado_da_vez(self):
+        return 0 if self.partida.turno_do_jogador else 1
+
+    def maos(self, lado):
+        """ (mão do lado, mão do oponente). """
+        p = self.partida
+        return (p.mao_jogador, p.mao_ia) if lado == 0 else (p.mao_ia, p.mao_jogador)
+
+    def estado(self, lado):
+        mao, oponente = self.maos(lado)
+        return {'mao': [c.indice for c in mao], 'oponente': len(oponente),
+                'empate': [c.indice for c in self.partida.pilha_empate], 'sua_vez': self.lado_da_vez == lado}
+
+    @staticmethod
+    def resultado(vencedor, lado):
+        """ Vencedor do motor (JOGADOR/IA/EMPATE/None) do ponto de vista do lado. """
+        if vencedor not in (motor.JOGADOR, motor.IA):
+            return protocolo.EMPATE
+        return protocolo.VOCE if (vencedor == motor.JOGADOR) == (lado == 0) else protocolo.OPONENTE
+
+class Servidor:
+    def __init__(self, dados, processos_ia=1, max_rodadas=10000, seed=None):
+        self.dados = dados
+        self.assinatura = replay.assinatura_baralho(dados)
+        self.processos_ia = processos_ia
+        self.max_rodadas = max_rodadas
+        self.pensador = None # Só criado na primeira partida difícil
+        self.rng_seeds = random.Random(seed)
+        self.fila_humanos = None # Sessão esperando um oponente humano
+        self.tarefas = set() # Decisões da IA difícil em andamento (referência até terminarem)
+        self.sessoes = 0
+        self.partidas_ativas = 0
+        self.partidas_terminadas = 0
+        self.rodadas = 0
+
+    async def atender(self, reader, writer):
+        sessao = Sessao(writer)
+        self.sessoes += 1
+        sessao.enviar(tipo='bem_vindo', assinatura=self.assinatura, atributos=self.dados.nomes_atributos)
+        try:
+            while True:
+                linha = await reader.readline() # ValueError se passar de protocolo.LIMITE_LINHA
+                if not linha:
+                    break
+                try:
+                    mensagem = protocolo.decodificar(linha)
+                except ValueError as erro:
+                    sessao.enviar(tipo='erro', mensagem=f"mensagem inválida: {erro}")
+                else:
+                    self.tratar(sessao, mensagem)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.sessoes -= 1
+            self.sair(sessao, conectada=False)
+            writer.close()
+
+    def tratar(self, sessao, mensagem):
+        tipo = mensagem['tipo']
+        if tipo == 'entrar':
+            self.entrar(sessao, mensagem)
+        elif tipo == 'escolher':
+            self.escolher(sessao, mensagem.get('atributo'))
+        elif tipo == 'sair':
+            self.sair(sessao)
+        else:
+            sessao.enviar(tipo='erro', mensagem=f"tipo desconhecido: {tipo!r}")
+
+    # --- Partidas ---
+
+    def entrar(self, sessao, mensagem):
+        if sessao.partida is not None or sessao is self.fila_humanos:
+            sessao.enviar(tipo='erro', mensagem="já está numa partida")
+            return
+        if mensagem.get('oponente') == 'humano':
+            if self.fila_humanos is None:
+                self.fila_humanos = sessao
+                sessao.enviar(tipo='aguardando')
+            else:
+                outra, self.fila_humanos = self.fila_humanos, None
+                self.iniciar([outra, sessao], None)
+            return
+        try:
+            dificuldade = Difficulty[mensagem.get('dificuldade', 'NORMAL')]
+        except (KeyError, TypeError): # TypeError: não é um texto (ex.: uma lista)
+            sessao.enviar(tipo='erro', mensagem=f"dificuldade desconhecida: {mensagem.get('dificuldade')!r}")
+            return
+        self.iniciar([sessao, None], dificuldade)
+
+    def iniciar(self, sessoes, dificuldade):
+        partida = PartidaRede(self.dados.cartas, sessoes, dificuldade, self.rng_seeds.getrandbits(32), self.max_rodadas)
+        self.partidas_ativas += 1
+        for lado, sessao in enumerate(sessoes):
+            if sessao is not None:
+                sessao.partida, sessao.lado = partida, lado
+                sessao.enviar(tipo='partida', oponente='humano' if dificuldade is None else 'ia', estado=partida.estado(lado))
+        self.avancar(partida)
+
+    def escolher(self, sessao, atributo):
+        partida = sessao.partida
+        if partida is None or partida.lado_da_vez != sessao.lado:
+            sessao.enviar(tipo='erro', mensagem="não é a sua vez")
+        elif not isinstance(atributo, str) or atributo not in self.dados.indice_atributo:
+            sessao.enviar(tipo='erro', mensagem=f"atributo desconhecido: {atributo!r}")
+        else:
+            self.jogar(partida, atributo)
+            self.avancar(partida)
+
+    def avancar(self, partida):
+        """ Joga as vezes da IA do servidor até chegar a vez de uma pessoa ou o fim da partida. """
+        while not partida.partida.terminou:
+            lado = partida.lado_da_vez
+            if partida.sessoes[lado] is not None:
+                return
+            if partida.dificuldade == Difficulty.DIFICIL:
+                tarefa = asyncio.get_running_loop().create_task(self.decidir_dificil(partida, lado))
+                self.tarefas.add(tarefa)
+                tarefa.add_done_callback(self.tarefas.discard)
+                return
+            mao = partida.maos(lado)[0]
+            self.jogar(partida, motor.escolher_atributo(mao[0], partida.dificuldade, partida.partida.rng))
+        p = partida.partida
+        motivo = 'cartas' if not p.mao_jogador or not p.mao_ia else 'limite' # Um empate pode esvaziar as duas mãos
+        self.terminar(partida, motivo, p.vencedor)
+
+    async def decidir_dificil(self, partida, lado):
+        if self.pensador is None:
+            self.pensador = ia.PensadorIA(self.dados, processos=self.processos_ia)
+        mao, oponente = partida.maos(lado)
+        ocultas = ia.cartas_ocultas(partida.cartas_iniciais[1 - lado], partida.partida.rodadas)
+        try:
+            atributo = await asyncio.wrap_future(self.pensador.pedir(mao, oponente, partida.partida.pilha_empate, partida.partida.rng, ocultas))
+        except Exception as erro: # Ex.: o processo da IA morreu; a partida segue com a IA normal
+            print(f"AVISO: IA difícil falhou ({erro!r}); usando a normal nesta jogada")
+            if self.pensador is not None:
+                self.pensador.encerrar()
+                self.pensador = None # A próxima jogada difícil sobe um processo novo
+            atributo = motor.escolher_atributo(mao[0], Difficulty.NORMAL, partida.partida.rng)
+        if partida.ativa: # O humano pode ter saído enquanto a IA pensava
+            self.jogar(partida, atributo)
+            self.avancar(partida)
+
+    def jogar(self, partida, atributo):
+        p = partida.partida
+        cartas = (p.mao_jogador[0].indice, p.mao_ia[0].indice)
+        vencedor = p.jogar_rodada(atributo)
+        self.rodadas += 1
+        for lado, sessao in enumerate(partida.sessoes):
+            if sessao is not None:
+                sessao.enviar(tipo='rodada', atributo=atributo, cartas=[cartas[lado], cartas[1 - lado]],
+                              vencedor=PartidaRede.resultado(vencedor, lado), estado=partida.estado(lado))
+
+    def terminar(self, partida, motivo, vencedor, exceto=None):
+        partida.ativa = False
+        self.partidas_ativas -= 1
+        self.partidas_terminadas += 1
+        for lado, sessao in enumerate(partida.sessoes):
+            if sessao is not None:
+                sessao.partida = None
+                if sessao is not exceto:
+                    sessao.enviar(tipo='fim', vencedor=PartidaRede.resultado(vencedor, lado), motivo=motivo)
+
+    def sair(self, sessao, conectada=True):
+        """ Tira a sessão da fila ou da partida; quem abandona perde. Desconectada, não recebe aviso. """
+        if sessao is self.fila_humanos:
+            self.fila_humanos = None
+        partida = sessao.partida
+        if partida is not None:
+            vencedor = motor.IA if sessao.lado == 0 else motor.JOGADOR
+            self.terminar(partida, 'abandono', vencedor, exceto=None if conectada else sessao)
+
+    # --- Execução ---
+
+    async def relatar(self, intervalo):
+        """ Imprime a cada `intervalo` segundos as sessões, partidas e rodadas por segundo. """
+        anterior, inicio = self.rodadas, time.perf_counter()
+        while True:
+            await asyncio.sleep(intervalo)
+            agora = time.perf_counter()
+            print(f"{self.sessoes} sessões, {self.partidas_ativas} partidas ativas, {self.partidas_terminadas} terminadas, "
+                  f"{(self.rodadas - anterior) / (agora - inicio):.0f} rodadas/s")
+            anterior, inicio = self.rodadas, agora
+
+    def encerrar(self):
+        if self.pensador is not None:
+            self.pensador.encerrar()
+
+async def servir(servidor, host, porta, status=None, pronto=None):
+    """ Atende até ser cancelado; `pronto(porta)` é chamado quando o socket está ouvindo. """
+    servidor_tcp = await asyncio.start_server(servidor.atender, host, porta, limit=protocolo.LIMITE_LINHA, backlog=1024)
+    porta = servidor_tcp.sockets[0].getsockname()[1]
+    if pronto is not None:
+        pronto(porta)
+    if status:
+        relatorio = asyncio.get_running_loop().create_task(servidor.relatar(status))
+    async with servidor_tcp:
+        try:
+            await servidor_tcp.serve_forever()
+        finally:
+            if status:
+                relatorio.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Super Trunfo (JSON por linha sobre TCP).")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--porta', type=int, default=protocolo.PORTA_PADRAO, help="0 escolhe uma porta livre")
+    parser.add_argument('--baralho', default='baralho.json')
+    parser.add_argument('--processos-ia', type=int, default=1, help="Processos para a IA difícil")
+    parser.add_argument('--max-rodadas', type=int, default=10000, help="Partidas mais longas terminam empatadas")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--status', type=float, default=None, metavar='SEG', help="Imprime estatísticas a cada SEG segundos")
+    args = parser.parse_args()
+
+    limite = aumentar_limite_arquivos()
+    servidor = Servidor(indice.carregar_baralho(args.baralho), args.processos_ia, args.max_rodadas, args.seed)
+    def pronto(porta):
+        print(f"Servidor de partidas em {args.host}:{porta} (até {limite or '?'} conexões)", flush=True)
+    try:
+        asyncio.run(servir(servidor, args.host, args.porta, args.status, pronto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.encerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+""" Simulador headless: roda muitas partidas IA vs IA em paralelo, sem pygame.
+
+Com --jogadores N (até o tamanho do baralho), o jogador senta no assento 0 contra N-1 IAs da
+mesma dificuldade, numa motor.PartidaN.
+
+Uso:
+    python simulador.py -n 10000 --seed 42 --processos 4
+    python simulador.py -n 10000 --jogadores 8
+"""
+import argparse
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+import ia
+import indice
+import motor
+import replay
+from motor import Difficulty
+
+# Estratégias disponíveis para o assento do "jogador" (função (carta, rng) -> atributo)
+ESTRATEGIAS = {
+    'aleatoria': lambda carta, rng: motor.escolher_atributo(carta, Difficulty.FACIL, rng),
+    'indice': lambda carta, rng: motor.escolher_atributo(carta, Difficulty.NORMAL, rng),
+}
+
+_dados = None # Carregado uma vez por processo (ver _iniciar_worker)
+
+def _iniciar_worker(arquivo_json):
+    global _dados
+    _dados = indice.carregar_baralho(arquivo_json)
+
+def _escolha_ia(dificuldade, partida, orcamento_ms):
+    if dificuldade == Difficulty.DIFICIL:
+        if isinstance(partida, motor.PartidaN):
+            return ia.escolha_dificil_n(partida, orcamento_ms)
+        return ia.escolha_dificil(partida, orcamento_ms)
+    return lambda carta, rng: motor.escolher_atributo(carta, dificuldade, rng)
+
+def jogar_partida(tarefa):
+    """ Roda uma partida e retorna (estrategia, dificuldade, vencedor, rodadas). """
+    seed, estrategia, nome_dificuldade, max_rodadas, orcamento_ms, pasta_replays, n_jogadores = tarefa
+    if n_jogadores > 2:
+        partida = motor.PartidaN(_dados.cartas, n_jogadores, random.Random(seed), max_rodadas)
+        escolha_ia = _escolha_ia(Difficulty[nome_dificuldade], partida, orcamento_ms)
+        assento = partida.jogar([ESTRATEGIAS[estrategia]] + [escolha_ia] * (n_jogadores - 1))
+        vencedor = None if assento is None else motor.JOGADOR if assento == 0 else motor.IA
+        return estrategia, nome_dificuldade, vencedor, partida.rodadas
+
+    partida = motor.Partida(_dados.cartas, random.Random(seed), max_rodadas)
+    gravador = None
+    if pasta_replays:
+        gravador = replay.GravadorReplay(os.path.join(pasta_replays, f"{seed}{replay.EXTENSAO}"), seed, _dados, descarregar=False)
+        partida.ao_rodada = gravador.rodada
+    vencedor = partida.jogar(ESTRATEGIAS[estrategia], _escolha_ia(Difficulty[nome_dificuldade], partida, orcamento_ms))
+    if gravador is not None:
+        gravador.fim(vencedor)
+    return estrategia, nome_dificuldade, vencedor, partida.rodadas
+
+def gerar_tarefas(n, seed, estrategias, dificuldades, max_rodadas, orcamento_ms, pasta_replays=None, n_jogadores=2):
+    """ Distribui as n partidas em rodízio entre todas as combinações estratégia x dificuldade. """
+    combinacoes = [(e, d) for e in estrategias for d in dificuldades]
+    for i in range(n):
+        estrategia, dificuldade = combinacoes[i % len(combinacoes)]
+        yield seed + i, estrategia, dificuldade, max_rodadas, orcamento_ms, pasta_replays, n_jogadores
+
+def simular(n, seed=0, estrategias=None, dificuldades=None, processos=None,
+            arquivo_json='baralho.json', max_rodadas=2000, orcamento_ms=10, pasta_replays=None, n_jogadores=2):
+    estrategias = estrategias or list(ESTRATEGIAS)
+    dificuldades = dificuldades or [d.name for d in Difficulty]
+    processos = processos or os.cpu_count() or 1
+    if pasta_replays:
+        os.makedirs(pasta_replays, exist_ok=True)
+    tarefas = gerar_tarefas(n, seed, estrategias, dificuldades, max_rodadas, orcamento_ms, pasta_replays, n_jogadores)
+
+    inicio = time.perf_counter()
+    if processos == 1:
+        _iniciar_worker(arquivo_json)
+        resultados = list(map(jogar_partida, tarefas))
+    else:
+        with Pool(processos, initializer=_iniciar_worker, initargs=(arquivo_json,)) as pool:
+            resultados = list(pool.imap_unordered(jogar_partida, tarefas, chunksize=max(1, n // (processos * 8))))
+    duracao = time.perf_counter() - inicio
+    return resultados, duracao
+
+def relatorio(resultados, duracao):
+    n = len(resultados)
+    rodadas = [r for _, _, _, r in resultados]
+    print(f"Partidas: {n} em {duracao:.2f}s ({n / duracao:.0f} partidas/s)")
+    print(f"Rodadas por partida: média {sum(rodadas) / n:.1f}, mín {min(rodadas)}, máx {max(rodadas)} ({sum(rodadas) / duracao:.0f} rodadas/s)")
+
+    por_estrategia, por_dificuldade = defaultdict(Counter), defaultdict(Counter)
+    for estrategia, dificuldade, vencedor, _ in resultados:
+        por_estrategia[estrategia][vencedor] += 1
+        por_dificuldade[dificuldade][vencedor] += 1
+
+    print("\nVitórias do jogador por estratégia:")
+    for estrategia, contagem in sorted(por_estrategia.items()):
+        total = sum(contagem.values())
+        print(f"  {estrategia:<12} {contagem[motor.JOGADOR] / total:6.1%}  (inconclusivas: {contagem[None]})")
+
+    print("\nVitórias da IA por dificuldade:")
+    for dificuldade, contagem in sorted(por_dificuldade.items()):
+        total = sum(contagem.values())
+        print(f"  {dificuldade:<12} {contagem[motor.IA] / total:6.1%}  (inconclusivas: {contagem[None]})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador headless de partidas de Super Trunfo.")
+    parser.add_argument('-n', '--partidas', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0, help="Seed da primeira partida (as demais usam seed+i)")
+    parser.add_argument('--processos', type=int, default=None, help="Padrão: número de núcleos")
+    parser.add_argument('--baralho', default='baralho.json')
+    parser.add_argument('--estrategias', default=','.join(ESTRATEGIAS), help=f"Estratégias do jogador, separadas por vírgula ({', '.join(ESTRATEGIAS)})")
+    parser.add_argument('--dificuldades', default=','.join(d.name for d in Difficulty), help="Dificuldades da IA, separadas por vírgula")
+    parser.add_argument('--max-rodadas', type=int, default=2000, help="Limite de rodadas antes de declarar a partida inconclusiva")
+    parser.add_argument('--orcamento-ms', type=float, default=10, help="Tempo de decisão por jogada da IA difícil")
+    parser.add_argument('--replays', default=None, help="Pasta onde gravar o replay de cada partida (<seed>.replay)")
+    parser.add_argument('--jogadores', type=int, default=2, help="Jogadores por partida: o jogador contra N-1 IAs")
+    args = parser.parse_args()
+    if args.jogadores < 2:
+        parser.error("--jogadores precisa ser pelo menos 2")
+    desconhecidas = [e for e in args.estrategias.split(',') if e not in ESTRATEGIAS]
+    if desconhecidas:
+        parser.error(f"estratégias desconhecidas: {', '.join(desconhecidas)} (opções: {', '.join(ESTRATEGIAS)})")
+    if args.replays and args.jogadores > 2:
+        parser.error("replays só existem para partidas de 2 jogadores")
+
+    resultados, duracao = simular(
+        args.partidas, args.seed,
+        estrategias=args.estrategias.split(','),
+        dificuldades=[d.upper() for d in args.dificuldades.split(',')],
+        processos=args.processos,
+        arquivo_json=args.baralho,
+        max_rodadas=args.max_rodadas,
+        orcamento_ms=args.orcamento_ms,
+        pasta_replays=args.replays,
+        n_jogadores=args.jogadores,
+    )
+    if args.jogadores > 2:
+        print(f"{args.jogadores} jogadores: o jogador contra {args.jogadores - 1} IAs (vitória da IA = qualquer uma delas)")
+    relatorio(resultados, duracao)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+""" Validação do baralho e CLI do compilador. """
+import json
+import subprocess
+import sys
+
+import pytest
+
+import compilador
+
+def baralho(**atributos):
+    return [{'nome': 'A', 'atributos': {'area': 1, **atributos}}, {'nome': 'B', 'atributos': {'area': 2, **atributos}}]
+
+def test_inteiro_grande_demais_e_erro_de_validacao():
+    erros = compilador.validar(baralho(area=10 ** 400))
+    assert any("'area'" in erro for erro in erros)
+
+@pytest.mark.parametrize('opcoes', [[], ['--verificar']])
+def test_cli_com_arquivo_inexistente_sai_com_mensagem(tmp_path, opcoes):
+    resultado = subprocess.run([sys.executable, 'compilador.py', str(tmp_path / 'nao_existe.json'), *opcoes],
+                               capture_output=True, text=True)
+    assert resultado.returncode == 1
+    assert 'nao_existe.json' in resultado.stderr
+    assert 'Traceback' not in resultado.stderr
+
+def test_cli_com_inteiro_grande_demais_sai_com_mensagem(tmp_path):
+    arquivo = tmp_path / 'enorme.json'
+    arquivo.write_text(json.dumps(baralho(area=10 ** 400)))
+    resultado = subprocess.run([sys.executable, 'compilador.py', str(arquivo)], capture_output=True, text=True)
+    assert resultado.returncode == 1
+    assert 'Traceback' not in resultado.stderr
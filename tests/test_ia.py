@@ -0,0 +1,25 @@
+""" IA difícil: uso das cartas do oponente cuja ordem já é conhecida. """
+import random
+
+import ia
+import motor
+
+def carta(nome, a, b):
+    return {'nome': nome, 'atributos': {'a': a, 'b': b}}
+
+# X vence mais cartas em 'a' (a IA normal joga 'a'), mas só vence Y e V em 'b'
+DADOS = motor.DadosBaralho([carta('X', 10, 1), carta('Y', 20, 0), carta('Z', 0, 5), carta('W', 1, 6),
+                            carta('V', 30, 0), carta('U', 2, 7)])
+X, Y, Z, W, V, U = range(6)
+
+def test_com_a_ordem_conhecida_joga_contra_o_topo_real():
+    assert motor.escolher_atributo(DADOS.cartas[X], motor.Difficulty.NORMAL) == 'a'
+    atributo, determinizacoes = ia.escolher_atributo_dificil(DADOS, [X], [Y, Z, W], (), 50, random.Random(0), desconhecidas=0)
+    assert (atributo, determinizacoes) == ('b', 1) # Sem cartas ocultas, o cenário é o real
+
+def test_n_jogadores_com_a_ordem_conhecida():
+    atributo, determinizacoes = ia.escolher_atributo_dificil_n(DADOS, [[Y, Z], [X], [V, W]], 1, (), 50, random.Random(0), [0, 0, 0])
+    assert (atributo, determinizacoes) == ('b', 1) # Y e V na mesa
+
+def test_cartas_ocultas():
+    assert [ia.cartas_ocultas(18, rodadas) for rodadas in (0, 5, 18, 40)] == [18, 13, 0, 0]
@@ -0,0 +1,26 @@
+""" Índice de rankings do baralho. """
+import json
+
+import indice
+import motor
+
+def test_melhor_atributo_alem_de_127_atributos():
+    k = 200
+    cartas = [{'nome': 'A', 'atributos': {f'a{j}': int(j == k - 1) for j in range(k)}},
+              {'nome': 'B', 'atributos': {f'a{j}': 0 for j in range(k)}},
+              {'nome': 'C', 'atributos': {f'a{j}': 0 for j in range(k)}, 'super_trunfo': True}]
+    dados = motor.DadosBaralho(cartas)
+    assert indice.IndiceBaralho.construir(dados).melhor_atributo(0) == f'a{k - 1}'
+
+def test_indice_reaproveita_o_hash_do_compilador(tmp_path, monkeypatch):
+    arquivo = tmp_path / 'baralho.json'
+    arquivo.write_text(json.dumps([{'nome': 'A', 'atributos': {'area': 1}},
+                                   {'nome': 'B', 'atributos': {'area': 2}, 'super_trunfo': True}]))
+    indice.carregar_baralho(str(arquivo)) # Grava o binário e o índice
+
+    def sem_hash(caminho):
+        raise AssertionError(f"{caminho} foi lido de novo para calcular o hash")
+    monkeypatch.setattr(indice, 'sha256_arquivo', sem_hash)
+    for _ in range(2): # Do JSON (cache do binário) e já com o índice gravado
+        dados = indice.carregar_baralho(str(arquivo))
+        assert dados.indice.melhor_atributo(0) == 'area'
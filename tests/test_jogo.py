@@ -0,0 +1,43 @@
+""" Textos de resultado do Jogo com N jogadores (sem janela: driver de vídeo dummy). """
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import jogo
+import motor
+
+def jogo_n(monkeypatch):
+    """ Jogo de 3 jogadores já numa partida; retorna (jogo, lista dos textos desenhados). """
+    j = jogo.Jogo(jogadores=3, seed=0)
+    j.esperar_carregamento()
+    j.aplicar_carregamento()
+    j.resetar_jogo(motor.Difficulty.NORMAL)
+    textos = []
+    monkeypatch.setattr(j, 'desenhar_texto', lambda surface, texto, *args, **kwargs: textos.append(texto))
+    return j, textos
+
+def test_eliminado_assiste_as_rodadas_sem_novo_voce_perdeu(monkeypatch):
+    j, textos = jogo_n(monkeypatch)
+    p = j.partida_n
+    p.maos[1].extend(p.maos[0]) # O jogador ficou sem cartas numa rodada anterior
+    p.maos[0].clear()
+    p.ativos = [1, 2]
+    p.vez = 1
+    j.turno_do_jogador = False
+    j.atributo_escolhido = motor.escolher_atributo(p.maos[1][0], motor.Difficulty.NORMAL)
+    j.mudar_estado(jogo.GameState.RESULTADO)
+
+    j.renderizar_feedback_estados()
+
+    assert "VOCÊ PERDEU!" not in textos
+    assert "EMPATE!" in textos or f"IA {j.assento_vencedor} VENCEU!" in textos
+
+def test_fim_de_jogo_nomeia_a_ia_vencedora(monkeypatch):
+    j, textos = jogo_n(monkeypatch)
+    j.partida_n.ativos = [2]
+    j.vencedor_partida = motor.IA
+
+    j.renderizar_fim_de_jogo()
+
+    assert "A IA 2 GANHOU O JOGO!" in textos
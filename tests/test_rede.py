@@ -0,0 +1,72 @@
+""" Partida completa em rede: servidor.py num thread e o Jogo como cliente, no modo 'sujo'. """
+import asyncio
+import os
+import threading
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import indice
+import jogo
+import servidor
+from relogio import INSTANTANEO
+
+LIMITE_SEGUNDOS = 30
+
+def iniciar_servidor():
+    """ Sobe o servidor numa porta livre, num thread com o próprio event loop; retorna (porta, parar). """
+    loop = asyncio.new_event_loop()
+    srv = servidor.Servidor(indice.carregar_baralho('baralho.json'), max_rodadas=300, seed=1)
+    pronto = threading.Event()
+    porta = []
+    def pronto_em(p):
+        porta.append(p)
+        pronto.set()
+    async def servir():
+        try:
+            await servidor.servir(srv, '127.0.0.1', 0, pronto=pronto_em)
+        except asyncio.CancelledError:
+            pass
+    tarefa = loop.create_task(servir())
+    thread = threading.Thread(target=loop.run_until_complete, args=(tarefa,), daemon=True)
+    thread.start()
+    assert pronto.wait(10)
+    def parar():
+        loop.call_soon_threadsafe(tarefa.cancel)
+        thread.join(10)
+        srv.encerrar()
+    return porta[0], parar
+
+def test_partida_remota_no_modo_sujo_chega_ao_fim():
+    porta, parar = iniciar_servidor()
+    try:
+        j = jogo.Jogo(modo_render='sujo', velocidade=INSTANTANEO, espectador=True, servidor=f'127.0.0.1:{porta}')
+        j.esperar_carregamento()
+        j.aplicar_carregamento()
+        j.clicar(j.botoes_menu[0]) # Fácil, contra a IA do servidor
+
+        # O próprio loop do jogo (com a espera de eventos do modo 'sujo') para ao chegar no fim
+        mudar_estado = j.mudar_estado
+        def parar_no_fim(estado):
+            mudar_estado(estado)
+            if estado == jogo.GameState.FIM_DE_JOGO:
+                j.rodando = False
+        j.mudar_estado = parar_no_fim
+        esgotado = []
+        def esgotar(): # Registra o estado e acorda o loop, que pode estar dormindo em pygame.event.wait
+            esgotado.append((j.game_state, list(j.mensagens_remotas)))
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        limite = threading.Timer(LIMITE_SEGUNDOS, esgotar)
+        limite.start()
+        try:
+            j.run()
+        finally:
+            limite.cancel()
+
+        assert not esgotado, f"o loop parou sem chegar ao fim da partida: {esgotado}"
+        assert j.game_state == jogo.GameState.FIM_DE_JOGO
+        assert not j.mensagens_remotas
+    finally:
+        parar()
@@ -0,0 +1,17 @@
+""" Regras de fim de partida do servidor, sem rede. """
+import motor
+import servidor
+from motor import Difficulty
+
+def carta(nome):
+    return {'nome': nome, 'atributos': {'area': 10, 'idh': 0.5}}
+
+def test_empate_que_esvazia_as_maos_termina_por_cartas():
+    dados = motor.DadosBaralho([carta('A'), carta('B')]) # Cartas iguais: a única rodada empata
+    srv = servidor.Servidor(dados, seed=0)
+    terminadas = []
+    srv.terminar = lambda partida, motivo, vencedor, exceto=None: terminadas.append((motivo, vencedor))
+
+    srv.iniciar([None, None], Difficulty.FACIL)
+
+    assert terminadas == [('cartas', None)]